@@ -51,7 +51,7 @@ class BCDDigits(max7219.MAX7219):
             self.write_cmd(cmd, data)
 
         self.clear_all()
-        self.show()
+        self.show(force=True)
 
     def set_digit(self, dpos: int, value: int) -> None:
         """
@@ -118,6 +118,40 @@ class BCDDigits(max7219.MAX7219):
             self.set_digit(cpos, value)
             cpos += 1
 
+    def show_number(self, value: float, decimals: int = 0, width: int = None) -> None:
+        """
+        Displays a number right aligned and updates the display, only the digit
+        registers that changed since the last update are sent. The number is
+        converted straight to BCD nibbles, unused leading digits are blanked.
+
+        :param value: the int or float to display
+        :param int decimals: digits after the decimal point (default 0)
+        :param int width: number of digits used, counted from the right; default all
+        """
+        if width is None:
+            width = self._ndigits
+        if not 0 < width <= self._ndigits or not 0 <= decimals < width:
+            raise ValueError("Width or decimals out of range")
+        # half away from zero, round() would show 2.5 as 2
+        number = int(abs(value) * 10**decimals + 0.5)
+        negative = value < 0 and number != 0
+        # the byte of digit position dpos is at self._ndigits - dpos - 1, so
+        # the least significant digit is byte 0
+        digits = bytearray(width)
+        for xpos in range(width):
+            if number or xpos <= decimals:
+                number, digit = divmod(number, 10)
+            elif negative:
+                digit = 10  # minus sign
+                negative = False
+            else:
+                digit = 0x0F  # blank
+            digits[xpos] = digit | 0x80 if decimals and xpos == decimals else digit
+        if number or negative:
+            raise ValueError("Number does not fit in {} digits".format(width))
+        self._buffer[:width] = digits
+        self.show()
+
     def show_help(self, start: int) -> None:
         """
         Display the word HELP in the display.
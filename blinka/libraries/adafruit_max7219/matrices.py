@@ -7,9 +7,18 @@
 `adafruit_max7219.matrices`
 ====================================================
 """
+
+import time
+
+try:
+    from threading import Event, Thread
+except ImportError:
+    # CircuitPython, call Grayscale.refresh() from the main loop
+    Thread = None
+
 from micropython import const
-from adafruit_framebuf import BitmapFont
 from adafruit_max7219 import max7219
+from xpander_lock import NoLock
 
 try:
     # Used only for typing
@@ -27,6 +36,25 @@ _SCANLIMIT = const(11)
 _SHUTDOWN = const(12)
 _DISPLAYTEST = const(15)
 
+# binary fonts read into memory, shared by all the matrices
+_FONTS = {}
+
+
+def _load_font(font_name: str) -> bytes:
+    """
+    Read a binary font file once. The first two bytes are the glyph width and
+    height followed by a byte per glyph column for each of the 256 characters.
+
+    :param str font_name: path to binary font file
+    :return: the font file contents
+    :rtype: bytes
+    """
+    font = _FONTS.get(font_name)
+    if font is None:
+        with open(font_name, "rb") as file:
+            font = _FONTS[font_name] = file.read()
+    return font
+
 
 class Matrix8x8(max7219.MAX7219):
     """
@@ -50,7 +78,7 @@ class Matrix8x8(max7219.MAX7219):
             self.write_cmd(cmd, data)
 
         self.fill(0)
-        self.show()
+        self.show(force=True)
 
     def text(
         self,
@@ -108,7 +136,8 @@ class CustomMatrix(max7219.ChainableMAX7219):
 
         self.framebuf.rotation = rotation
         self.framebuf.fill_rect = self._fill_rect
-        self._font = None
+        self._pixel_index, self._pixel_mask = self._calculate_pixel_tables()
+        self._row_spans = self._calculate_row_spans()
 
     def _calculate_y_coordinate_offsets(self) -> None:
         y_chunks = []
@@ -130,6 +159,70 @@ class CustomMatrix(max7219.ChainableMAX7219):
             y_index += chunk
         return y_index
 
+    def _calculate_pixel_tables(self) -> Tuple[list, bytearray]:
+        """
+        Map every matrix pixel to its byte in the buffer and the bit within
+        that byte, following the chip layout and the framebuffer rotation.
+        The pixel at (x, y) is entry ``y * width + x``, the byte index is -1
+        for pixels that fall outside the buffer.
+
+        :return: byte index and bit mask tables
+        :rtype: Tuple[list, bytearray]
+        """
+        fb_width = self.framebuf.width
+        fb_height = self.framebuf.height
+        rotation = self.framebuf.rotation
+        pixel_index = [-1] * (self.width * self.height)
+        pixel_mask = bytearray(self.width * self.height)
+        for ypos in range(self.height):
+            for xpos in range(self.width):
+                buffer_x, buffer_y = self._pixel_coords_to_framebuf_coords(xpos, ypos)
+                # the rotation as applied by FrameBuffer.pixel
+                if rotation == 1:
+                    buffer_x, buffer_y = fb_width - buffer_y - 1, buffer_x
+                elif rotation == 2:
+                    buffer_x = fb_width - buffer_x - 1
+                    buffer_y = fb_height - buffer_y - 1
+                elif rotation == 3:
+                    buffer_x, buffer_y = buffer_y, fb_height - buffer_x - 1
+                if 0 <= buffer_x < fb_width and 0 <= buffer_y < fb_height:
+                    pixel = ypos * self.width + xpos
+                    pixel_index[pixel] = (buffer_y >> 3) * fb_width + buffer_x
+                    pixel_mask[pixel] = 1 << (buffer_y & 7)
+        return pixel_index, pixel_mask
+
+    def _calculate_row_spans(self) -> list:
+        """
+        For each row find the buffer byte of each 8 column chunk with the
+        running OR of its pixel masks, so the mask of the columns ``lo`` to
+        ``hi`` in a chunk is ``masks[hi + 1] ^ masks[lo]``. A row is None when
+        its chunks do not map to a single byte each.
+
+        :return: (buffer index, running masks) per chunk for each row
+        :rtype: list
+        """
+        row_spans = []
+        for ypos in range(self.height):
+            chunks = []
+            for chunk in range(self.width // 8):
+                pixel = ypos * self.width + chunk * 8
+                index = self._pixel_index[pixel]
+                if index < 0 or self._pixel_index[pixel : pixel + 8] != [index] * 8:
+                    chunks = None
+                    break
+                masks = bytearray(9)
+                for col in range(8):
+                    if masks[col] & self._pixel_mask[pixel + col]:
+                        break
+                    masks[col + 1] = masks[col] | self._pixel_mask[pixel + col]
+                else:
+                    chunks.append((index, masks))
+                    continue
+                chunks = None
+                break
+            row_spans.append(chunks)
+        return row_spans
+
     def init_display(self) -> None:
         for cmd, data in (
             (_SHUTDOWN, 0),
@@ -141,7 +234,7 @@ class CustomMatrix(max7219.ChainableMAX7219):
             self.write_cmd(cmd, data)
 
         self.fill(0)
-        self.show()
+        self.show(force=True)
 
     def clear_all(self) -> None:
         """
@@ -160,8 +253,14 @@ class CustomMatrix(max7219.ChainableMAX7219):
         """
         if xpos < 0 or ypos < 0 or xpos >= self.width or ypos >= self.height:
             return
-        buffer_x, buffer_y = self._pixel_coords_to_framebuf_coords(xpos, ypos)
-        return super().pixel(buffer_x, buffer_y, bit_value=bit_value)
+        pixel = ypos * self.width + xpos
+        index = self._pixel_index[pixel]
+        if index < 0:
+            return
+        if bit_value:
+            self._buffer[index] |= self._pixel_mask[pixel]
+        else:
+            self._buffer[index] &= ~self._pixel_mask[pixel]
 
     def _pixel_coords_to_framebuf_coords(self, xpos: int, ypos: int) -> Tuple[int]:
         """
@@ -185,13 +284,14 @@ class CustomMatrix(max7219.ChainableMAX7219):
         :return: value of pixel in matrix
         :rtype: int
         """
-        x, y = self._pixel_coords_to_framebuf_coords(xpos, ypos)
-        buffer_value = self._buffer[-1 * y - 1]
-        return ((buffer_value & 2**x) >> x) & 1
+        if xpos < 0 or ypos < 0 or xpos >= self.width or ypos >= self.height:
+            return 0
+        pixel = ypos * self.width + xpos
+        index = self._pixel_index[pixel]
+        if index < 0:
+            return 0
+        return 1 if self._buffer[index] & self._pixel_mask[pixel] else 0
 
-    # Adafruit Circuit Python Framebuf Scroll Function
-    # Authors: Kattni Rembor, Melissa LeBlanc-Williams and Tony DiCola, for Adafruit Industries
-    # License: MIT License (https://opensource.org/licenses/MIT)
     def scroll(self, delta_x: int, delta_y: int) -> None:
         """
         Srcolls the display using delta_x, delta_y.
@@ -199,28 +299,25 @@ class CustomMatrix(max7219.ChainableMAX7219):
         :param int delta_x: positions to scroll in the x direction
         :param int delta_y: positions to scroll in the y direction
         """
-        if delta_x < 0:
-            shift_x = 0
-            xend = self.width + delta_x
-            dt_x = 1
-        else:
-            shift_x = self.width - 1
-            xend = delta_x - 1
-            dt_x = -1
-        if delta_y < 0:
-            y = 0
-            yend = self.height + delta_y
-            dt_y = 1
-        else:
-            y = self.height - 1
-            yend = delta_y - 1
-            dt_y = -1
-        while y != yend:
-            x = shift_x
-            while x != xend:
-                self.pixel(x, y, self._get_pixel(x - delta_x, y - delta_y))
-                x += dt_x
-            y += dt_y
+        width = self.width
+        height = self.height
+        buffer = self._buffer
+        source = bytes(buffer)
+        pixel_index = self._pixel_index
+        pixel_mask = self._pixel_mask
+        # pixels scrolled in from outside the display are left as they were
+        for ypos in range(max(0, delta_y), min(height, height + delta_y)):
+            src = (ypos - delta_y) * width - delta_x
+            dst = ypos * width
+            for xpos in range(max(0, delta_x), min(width, width + delta_x)):
+                index = pixel_index[dst + xpos]
+                if index < 0:
+                    continue
+                src_index = pixel_index[src + xpos]
+                if src_index >= 0 and source[src_index] & pixel_mask[src + xpos]:
+                    buffer[index] |= pixel_mask[dst + xpos]
+                else:
+                    buffer[index] &= ~pixel_mask[dst + xpos]
 
     def rect(
         self, x: int, y: int, width: int, height: int, color: int, fill: bool = False
@@ -236,16 +333,53 @@ class CustomMatrix(max7219.ChainableMAX7219):
         :param bool fill: 1 pixel outline or filled rectangle (default: False)
         """
         # pylint: disable=too-many-arguments
-        for row in range(height):
-            y_pos = row + y
-            for col in range(width):
-                x_pos = col + x
-                if fill:
-                    self.pixel(x_pos, y_pos, color)
-                elif y_pos in (y, y + height - 1) or x_pos in (x, x + width - 1):
-                    self.pixel(x_pos, y_pos, color)
-                else:
-                    continue
+        x_start = max(x, 0)
+        x_end = min(x + width, self.width) - 1
+        y_start = max(y, 0)
+        y_end = min(y + height, self.height) - 1
+        if x_start > x_end or y_start > y_end:
+            return
+        if fill:
+            for y_pos in range(y_start, y_end + 1):
+                self._span(y_pos, x_start, x_end, color)
+            return
+        # the outline as four edge spans
+        if y == y_start:
+            self._span(y, x_start, x_end, color)
+        if y + height - 1 == y_end:
+            self._span(y_end, x_start, x_end, color)
+        for y_pos in range(y_start, y_end + 1):
+            if x == x_start:
+                self._span(y_pos, x, x, color)
+            if x + width - 1 == x_end:
+                self._span(y_pos, x_end, x_end, color)
+
+    def _span(self, ypos: int, x_start: int, x_end: int, color: int) -> None:
+        """
+        Set or clear the pixels ``x_start`` to ``x_end`` of a row by masking
+        whole chip bytes, the span must be within the matrix.
+
+        :param int ypos: row
+        :param int x_start: first column
+        :param int x_end: last column
+        :param int color: > 0 sets the pixels, otherwise clears them
+        """
+        buffer = self._buffer
+        chunks = self._row_spans[ypos]
+        if chunks is None:
+            for xpos in range(x_start, x_end + 1):
+                self.pixel(xpos, ypos, color)
+            return
+        last = x_end >> 3
+        for chunk in range(x_start >> 3, last + 1):
+            index, masks = chunks[chunk]
+            low = x_start - (chunk << 3) if chunk << 3 < x_start else 0
+            high = x_end - (chunk << 3) if chunk == last else 7
+            mask = masks[high + 1] ^ masks[low]
+            if color:
+                buffer[index] |= mask
+            else:
+                buffer[index] &= ~mask
 
     def _fill_rect(self, x: int, y: int, width: int, height: int, color: int) -> None:
         """
@@ -283,21 +417,557 @@ class CustomMatrix(max7219.ChainableMAX7219):
         :param str font_name: path to binary font file (default: "font5x8.bin")
         :param int size: size of the font, acts as a multiplier
         """
+        # pylint: disable=too-many-locals
+        font = _load_font(font_name)
+        width = font[0]
+        height = font[1]
+        size = max(size, 1)
         for chunk in strg.split("\n"):
-            if not self._font or self._font.font_name != font_name:
-                # load the font!
-                self._font = BitmapFont(font_name)
-            width = self._font.font_width
-            height = self._font.font_height
             for i, char in enumerate(chunk):
                 char_x = xpos + (i * (width + 1)) * size
-                if (
+                if not (
                     char_x + (width * size) > 0
                     and char_x < self.width
                     and ypos + (height * size) > 0
                     and ypos < self.height
                 ):
-                    self._font.draw_char(
-                        char, char_x, ypos, self.framebuf, color, size=size
-                    )
+                    continue
+                glyph = 2 + ord(char) * width
+                for char_col in range(width):
+                    if glyph + char_col >= len(font):
+                        break
+                    line = font[glyph + char_col]
+                    for char_row in range(height):
+                        if (line >> char_row) & 0x1:
+                            self.rect(
+                                char_x + char_col * size,
+                                ypos + char_row * size,
+                                size,
+                                size,
+                                color,
+                                True,
+                            )
+            ypos += height * size
+
+
+class Matrix16x8(max7219.ChainableMAX7219):
+    """
+    Driver for the 16x8 LED board, two daisy chained MAX7219 chips side by side.
+    The buffer is kept in register order, a row of the board is the 2 bytes
+    sent to one digit register with bit ``x`` of the row in big-endian order,
+    so ``show()`` sends each row straight from a slice of the buffer and the
+    drawing is done on whole rows.
+
+    :param ~busio.SPI spi: an spi busio or spi bitbangio object
+    :param ~digitalio.DigitalInOut cs: digital in/out to use as chip select signal
+    """
+
+    def __init__(self, spi: busio.SPI, cs: digitalio.DigitalInOut):
+        super().__init__(16, 8, spi, cs)
+
+    def init_display(self) -> None:
+        for cmd, data in (
+            (_SHUTDOWN, 0),
+            (_DISPLAYTEST, 0),
+            (_SCANLIMIT, 7),
+            (_DECODEMODE, 0),
+            (_SHUTDOWN, 1),
+        ):
+            self.write_cmd(cmd, data)
+
+        self.fill(0)
+        self.show(force=True)
+
+    def clear_all(self) -> None:
+        """
+        Clears all matrix leds.
+        """
+        self.fill(0)
+
+    def _get_row(self, ypos: int) -> int:
+        """
+        Get a row of the board.
+
+        :param int ypos: row
+        :return: the row with bit ``x`` set for each lit pixel
+        :rtype: int
+        """
+        index = (7 - ypos) * 2
+        return int.from_bytes(self._buffer[index : index + 2], "big")
+
+    def _set_row(self, ypos: int, bits: int) -> None:
+        """
+        Set a row of the board.
+
+        :param int ypos: row
+        :param int bits: the row with bit ``x`` set for each lit pixel
+        """
+        index = (7 - ypos) * 2
+        self._buffer[index : index + 2] = (bits & 0xFFFF).to_bytes(2, "big")
+
+    def fill(self, bit_value: int) -> None:
+        """
+        Fill the display buffer.
+
+        :param int bit_value: value > 0 set the buffer bit, else clears the buffer bit
+        """
+        self._buffer[:] = (b"\xff" if bit_value else b"\x00") * 16
+
+    # pylint: disable=inconsistent-return-statements
+    def pixel(self, xpos: int, ypos: int, bit_value: int = None) -> None:
+        """
+        Set one buffer bit
+
+        :param int xpos: x position to set bit
+        :param int ypos: y position to set bit
+        :param int bit_value: value > 0 sets the buffer bit, else clears the buffer bit
+        """
+        if not (0 <= xpos < 16 and 0 <= ypos < 8):
+            return
+        index = (7 - ypos) * 2 + 1 - (xpos >> 3)
+        if bit_value:
+            self._buffer[index] |= 1 << (xpos & 7)
+        else:
+            self._buffer[index] &= ~(1 << (xpos & 7))
+
+    def fill_rect(self, x: int, y: int, width: int, height: int, color: int) -> None:
+        """
+        Draw a filled rectangle at the given position of the given size, color.
+
+        :param int x: x position
+        :param int y: y position
+        :param int width: width of rectangle
+        :param int height: height of rectangle
+        :param int color: color of rectangle
+        """
+        # pylint: disable=too-many-arguments
+        x_start = max(x, 0)
+        x_end = min(x + width, 16)
+        if x_start >= x_end:
+            return
+        mask = ((1 << (x_end - x_start)) - 1) << x_start
+        for ypos in range(max(y, 0), min(y + height, 8)):
+            if color:
+                self._set_row(ypos, self._get_row(ypos) | mask)
+            else:
+                self._set_row(ypos, self._get_row(ypos) & ~mask)
+
+    def scroll(self, delta_x: int, delta_y: int) -> None:
+        """
+        Srcolls the display using delta_x, delta_y. Pixels scrolled in from
+        outside the display are left as they were.
+
+        :param int delta_x: positions to scroll in the x direction
+        :param int delta_y: positions to scroll in the y direction
+        """
+        rows = [self._get_row(ypos) for ypos in range(8)]
+        # the columns scrolled in keep the pixels of the row they land on
+        if delta_x >= 0:
+            keep = (1 << min(delta_x, 16)) - 1
+        else:
+            keep = 0xFFFF & ~(0xFFFF >> -delta_x)
+        for ypos in range(max(0, delta_y), min(8, 8 + delta_y)):
+            row = rows[ypos - delta_y]
+            row = row << delta_x if delta_x >= 0 else row >> -delta_x
+            self._set_row(ypos, (row & ~keep) | (rows[ypos] & keep))
+
+    def blit(self, columns: bytes, xpos: int = 0, ypos: int = 0) -> None:
+        """
+        Copy a bitmap of column bytes onto the board, bit 0 of a column is its
+        top pixel, as in the binary fonts. Set and clear pixels are both copied.
+
+        :param bytes columns: a byte per bitmap column
+        :param int xpos: x position of the first column
+        :param int ypos: y position of the top row
+        """
+        rows, covered = self._columns_to_rows(columns, xpos)
+        for row in range(max(0, -ypos), min(8, 8 - ypos)):
+            self._set_row(
+                ypos + row, (self._get_row(ypos + row) & ~covered) | rows[row]
+            )
+
+    def _columns_to_rows(self, columns: bytes, xpos: int) -> Tuple[list, int]:
+        """
+        Turn the visible part of a bitmap of column bytes into board rows.
+
+        :param bytes columns: a byte per bitmap column
+        :param int xpos: x position of the first column
+        :return: the 8 rows of lit pixels and the mask of the visible columns
+        :rtype: Tuple[list, int]
+        """
+        rows = [0] * 8
+        covered = 0
+        for column in range(max(0, -xpos), min(len(columns), 16 - xpos)):
+            bit = 1 << (xpos + column)
+            covered |= bit
+            line = columns[column]
+            row = 0
+            while line:
+                if line & 1:
+                    rows[row] |= bit
+                line >>= 1
+                row += 1
+        return rows, covered
+
+    def text(
+        self,
+        strg: str,
+        xpos: int,
+        ypos: int,
+        color: int = 1,
+        *,
+        font_name: str = "font5x8.bin",
+        size: int = 1
+    ) -> None:
+        """
+        Draw text in the matrix.
+
+        :param str strg: string to place in to display
+        :param int xpos: x position of LED in matrix
+        :param int ypos: y position of LED in matrix
+        :param int color: > 1 sets the text, otherwise resets
+        :param str font_name: path to binary font file (default: "font5x8.bin")
+        :param int size: size of the font, acts as a multiplier
+        """
+        # pylint: disable=too-many-locals
+        font = _load_font(font_name)
+        width = font[0]
+        height = font[1]
+        size = max(size, 1)
+        for chunk in strg.split("\n"):
+            # the visible glyph columns of the line, a blank column between glyphs
+            strip = bytearray()
+            for char in chunk:
+                glyph = 2 + (ord(char) & 0xFF) * width
+                strip += font[glyph : glyph + width]
+                strip.append(0)
+            if size == 1:
+                rows, _ = self._columns_to_rows(strip, xpos)
+                for row in range(max(0, -ypos), min(height, 8 - ypos)):
+                    if color:
+                        self._set_row(ypos + row, self._get_row(ypos + row) | rows[row])
+                    else:
+                        self._set_row(
+                            ypos + row, self._get_row(ypos + row) & ~rows[row]
+                        )
+            else:
+                for column, line in enumerate(strip):
+                    for row in range(height):
+                        if (line >> row) & 0x1:
+                            self.fill_rect(
+                                xpos + column * size,
+                                ypos + row * size,
+                                size,
+                                size,
+                                color,
+                            )
             ypos += height * size
+
+
+# bit reversed bytes, for chips wired with the first column in the top bit
+_REVERSED = bytes(
+    sum(((value >> bit) & 1) << (7 - bit) for bit in range(8)) for value in range(256)
+)
+
+
+class Marquee:
+    """
+    Scrolls a message across a CustomMatrix. The message is rendered once into
+    a strip of glyph column bytes, each frame only copies the visible window
+    of that strip into the matrix buffer, a byte per chip row.
+
+    :param CustomMatrix matrix: the matrix to scroll the message on
+    :param str strg: the message
+    :param float speed: scroll speed in columns per second (default 20)
+    :param int ypos: top row of the message (default 0)
+    :param bool loop: start again once the message has scrolled off (default True)
+    :param str font_name: path to binary font file (default: "font5x8.bin")
+    """
+
+    def __init__(
+        self,
+        matrix: CustomMatrix,
+        strg: str,
+        *,
+        speed: float = 20,
+        ypos: int = 0,
+        loop: bool = True,
+        font_name: str = "font5x8.bin"
+    ):
+        # pylint: disable=too-many-arguments
+        self.matrix = matrix
+        self.speed = speed
+        self.ypos = ypos
+        self.loop = loop
+        self.font_name = font_name
+        self._rows_plan = self._calculate_rows_plan()
+        self._start = None
+        self.position = -1
+        self.set_text(strg)
+
+    def _calculate_rows_plan(self) -> list:
+        """
+        For each message row find the buffer byte of each 8 column chunk and
+        whether its bits run backwards. None when a chunk does not map to a
+        single byte, those rows fall back to the pixel tables.
+
+        :return: (buffer index, reversed) per chunk for each row
+        :rtype: list
+        """
+        # pylint: disable=protected-access
+        matrix = self.matrix
+        plan = []
+        for row in range(8):
+            ypos = self.ypos + row
+            if not 0 <= ypos < matrix.height:
+                plan.append([])
+                continue
+            chunks = []
+            for chunk in range(matrix.width // 8):
+                pixel = ypos * matrix.width + chunk * 8
+                index = matrix._pixel_index[pixel]
+                masks = matrix._pixel_mask[pixel : pixel + 8]
+                if matrix._pixel_index[pixel : pixel + 8] != [index] * 8 or index < 0:
+                    chunks = None
+                    break
+                if list(masks) == [1 << bit for bit in range(8)]:
+                    chunks.append((index, False))
+                elif list(masks) == [0x80 >> bit for bit in range(8)]:
+                    chunks.append((index, True))
+                else:
+                    chunks = None
+                    break
+            plan.append(chunks)
+        return plan
+
+    def set_text(self, strg: str) -> None:
+        """
+        Render a new message and start scrolling it from the beginning.
+
+        :param str strg: the message
+        """
+        font = _load_font(self.font_name)
+        width = font[0]
+        # start blank so the message scrolls in from the right
+        strip = bytearray(self.matrix.width)
+        for char in strg:
+            glyph = 2 + (ord(char) & 0xFF) * width
+            strip += font[glyph : glyph + width]
+            strip.append(0)
+        self.length = len(strip)
+        # one int per row with a bit per strip column
+        self._row_bits = []
+        for row in range(8):
+            bits = 0
+            for column, line in enumerate(strip):
+                if (line >> row) & 1:
+                    bits |= 1 << column
+            if self.loop:
+                # a second copy so the window can wrap around the end
+                bits |= bits << self.length
+            self._row_bits.append(bits)
+        self._start = None
+        self.position = -1
+
+    def render(self, position: int) -> None:
+        """
+        Copy the window of the message starting at a strip column into the
+        matrix buffer, call the matrix ``show()`` to display it.
+
+        :param int position: first strip column to display
+        """
+        matrix = self.matrix
+        buffer = matrix._buffer  # pylint: disable=protected-access
+        width = matrix.width
+        window = (1 << width) - 1
+        for row, chunks in enumerate(self._rows_plan):
+            bits = (self._row_bits[row] >> position) & window
+            if chunks is None:
+                ypos = self.ypos + row
+                for xpos in range(width):
+                    matrix.pixel(xpos, ypos, (bits >> xpos) & 1)
+                continue
+            for index, backwards in chunks:
+                value = bits & 0xFF
+                buffer[index] = _REVERSED[value] if backwards else value
+                bits >>= 8
+
+    def update(self) -> bool:
+        """
+        Move the message to where it should be at the current time and show
+        it when it moved. Frames that were missed are skipped so the speed
+        does not drift.
+
+        :return: False once a message that does not loop has scrolled off
+        :rtype: bool
+        """
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+        position = int((now - self._start) * self.speed)
+        if self.loop:
+            position %= self.length
+        elif position > self.length:
+            return False
+        if position != self.position:
+            self.position = position
+            self.render(position)
+            self.matrix.show()
+        return True
+
+    def run(self, fps: float = 50, duration: float = None) -> None:
+        """
+        Scroll the message, pacing the frames at a fixed rate.
+
+        :param float fps: frames per second (default 50)
+        :param float duration: seconds to scroll for, None until a message that
+          does not loop has scrolled off (default None)
+        """
+        period = 1 / fps
+        start = next_frame = time.monotonic()
+        while self.update():
+            next_frame += period
+            now = time.monotonic()
+            if duration is not None and now - start >= duration:
+                break
+            if next_frame > now:
+                time.sleep(next_frame - now)
+            else:
+                # running late, restart the pacing from now
+                next_frame = now
+
+
+class Grayscale:
+    """
+    Shows a 2 to 4 bit per pixel image on a CustomMatrix by temporal dithering.
+    ``show()`` splits the image into one buffer per bit plane, the refresh then
+    cycles through the planes with plane ``b`` on screen for ``2**b`` of every
+    ``2**bits - 1`` frames. Only the rows that differ from the previous frame
+    are sent.
+
+    :param CustomMatrix matrix: the matrix to show the image on
+    :param int bits: bits per pixel, 2 to 4 (default 2)
+    :param float fps: bit plane frames per second (default 200)
+    :param lock: held around each frame sent, e.g. ``Xpander.LOCK`` so the
+      refresh thread doesn't interleave with the other I/O (default no lock)
+    """
+
+    def __init__(
+        self, matrix: CustomMatrix, *, bits: int = 2, fps: float = 200, lock=None
+    ):
+        if not 2 <= bits <= 4:
+            raise ValueError("Bits out of range")
+        self.matrix = matrix
+        self.lock = lock if lock else NoLock()
+        self.bits = bits
+        self.levels = (1 << bits) - 1
+        self.fps = fps
+        self.image = bytearray(matrix.width * matrix.height)
+        # plane shown in each frame of the cycle, the most significant plane
+        # every other frame so the brightness is spread evenly over the cycle
+        self._sequence = []
+        for frame in range(1, self.levels + 1):
+            plane = bits - 1
+            while not frame & 1:
+                frame >>= 1
+                plane -= 1
+            self._sequence.append(plane)
+        self._frames = None
+        self._frame = 0
+        self._thread = None
+        self._stop = None
+        self.show()
+
+    def pixel(self, xpos: int, ypos: int, level: int = None) -> int:
+        """
+        Set or get the level of one pixel of the image.
+
+        :param int xpos: x position of the pixel
+        :param int ypos: y position of the pixel
+        :param int level: 0 (off) to ``levels`` (full), None to read the level
+        :return: the level when reading
+        :rtype: int
+        """
+        if not (0 <= xpos < self.matrix.width and 0 <= ypos < self.matrix.height):
+            return None
+        pixel = ypos * self.matrix.width + xpos
+        if level is None:
+            return self.image[pixel]
+        self.image[pixel] = min(max(level, 0), self.levels)
+        return None
+
+    def fill(self, level: int) -> None:
+        """
+        Set every pixel of the image to one level.
+
+        :param int level: 0 (off) to ``levels`` (full)
+        """
+        level = min(max(level, 0), self.levels)
+        self.image[:] = bytes((level,)) * len(self.image)
+
+    def show(self) -> None:
+        """
+        Split the image into its bit plane buffers, the next frame refreshed
+        shows the new image.
+        """
+        # pylint: disable=protected-access
+        pixel_index = self.matrix._pixel_index
+        pixel_mask = self.matrix._pixel_mask
+        planes = [bytearray(len(self.matrix._buffer)) for _ in range(self.bits)]
+        for pixel, level in enumerate(self.image):
+            index = pixel_index[pixel]
+            if not level or index < 0:
+                continue
+            mask = pixel_mask[pixel]
+            for plane in planes:
+                if level & 1:
+                    plane[index] |= mask
+                level >>= 1
+        # swapped in one assignment, so the refresh thread sees a whole image
+        self._frames = [planes[plane] for plane in self._sequence]
+
+    def refresh(self) -> None:
+        """
+        Display the next frame of the cycle.
+        """
+        frames = self._frames
+        self._frame = (self._frame + 1) % len(frames)
+        with self.lock:
+            # pylint: disable=protected-access
+            self.matrix._buffer[:] = frames[self._frame]
+            self.matrix.show()
+
+    def start(self) -> None:
+        """
+        Refresh the matrix from a background thread at ``fps`` frames per second.
+        """
+        if Thread is None:
+            raise RuntimeError("No threads, call refresh() from the main loop")
+        if self._thread is not None:
+            return
+        self._stop = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background refresh, the last frame stays on the matrix.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        period = 1 / self.fps
+        next_frame = time.monotonic()
+        while not self._stop.is_set():
+            self.refresh()
+            next_frame += period
+            now = time.monotonic()
+            if next_frame > now:
+                self._stop.wait(next_frame - now)
+            else:
+                # running late, restart the pacing from now
+                next_frame = now
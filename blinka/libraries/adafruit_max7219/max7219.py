@@ -73,6 +73,9 @@ class MAX7219:
     :param int phase: for SPIDevice phase (default 0)
     """
 
+    # number of chips daisy chained on the chip select
+    chain_length = 1
+
     def __init__(
         self,
         width: int,
@@ -90,9 +93,28 @@ class MAX7219:
         self._spi_device = spi_device.SPIDevice(
             spi, cs, baudrate=baudrate, polarity=polarity, phase=phase
         )
+        self._spi = spi
+        self._spi_config = {
+            "baudrate": baudrate,
+            "polarity": polarity,
+            "phase": phase,
+        }
+
+        # preallocated [digit register, data] * chain_length payload per row
+        self._rows = bytearray(16 * self.chain_length)
+        for ypos in range(8):
+            start = ypos * 2 * self.chain_length
+            self._rows[start : start + 2 * self.chain_length : 2] = bytes(
+                [_DIGIT0 + ypos] * self.chain_length
+            )
+
+        # preallocated [cmd, data] * chain_length payload for write_cmd
+        self._cmd = bytearray(2 * self.chain_length)
 
         self._buffer = bytearray((height // 8) * width)
         self.framebuf = framebuf.FrameBuffer1(self._buffer, width, height)
+        # copy of the register values last sent, None until the first show
+        self._shadow = None
 
         self.width = width
         self.height = height
@@ -112,12 +134,74 @@ class MAX7219:
             raise ValueError("Brightness out of range")
         self.write_cmd(_INTENSITY, value)
 
-    def show(self) -> None:
+    def show(self, force: bool = False) -> None:
         """
-        Updates the display.
+        Updates the display, only the rows where any chip changed since the
+        last update are sent. Nothing is sent when nothing changed.
+
+        :param bool force: resend every row, E.g. after a glitch (default False)
         """
-        for ypos in range(8):
-            self.write_cmd(_DIGIT0 + ypos, self._buffer[ypos])
+        rows = self._dirty_rows(force)
+        if rows:
+            self._write_rows(rows)
+
+    def _dirty_rows(self, force: bool = False) -> list:
+        """
+        Copies the changed rows of the buffer into their payloads.
+
+        :param bool force: treat every row as changed (default False)
+        :return: the rows to send
+        :rtype: list
+        """
+        rows = self._rows
+        buffer = memoryview(self._buffer)
+        chain = self.chain_length
+        shadow = self._shadow
+        if shadow is None or force:
+            shadow = self._shadow = bytearray(8 * chain)
+            force = True
+        dirty = []
+        # a BCD display with fewer than 8 digits only has a byte per digit
+        for ypos in range(min(8, len(buffer) // chain)):
+            data = buffer[ypos * chain : (ypos + 1) * chain]
+            if not force and data == shadow[ypos * chain : (ypos + 1) * chain]:
+                continue
+            start = ypos * 2 * chain
+            rows[start + 1 : start + 2 * chain : 2] = data
+            shadow[ypos * chain : (ypos + 1) * chain] = data
+            dirty.append(ypos)
+        return dirty
+
+    def _write_rows(self, rows: list) -> None:
+        """
+        Sends the row payloads in one batch, the bus is locked and configured
+        once.
+
+        :param list rows: the rows to send
+        """
+        spi = self._spi
+        while not spi.try_lock():
+            pass
+        try:
+            spi.configure(**self._spi_config)
+            self._send_rows(spi, rows)
+        finally:
+            spi.unlock()
+
+    def _send_rows(self, spi: busio.SPI, rows: list) -> None:
+        """
+        Writes the row payloads to a locked and configured bus, chip select is
+        toggled around each row to latch it.
+
+        :param ~busio.SPI spi: the locked spi bus
+        :param list rows: the rows to send
+        """
+        payload = memoryview(self._rows)
+        size = 2 * self.chain_length
+        for ypos in rows:
+            self._chip_select.value = False
+            spi.write(payload[ypos * size : (ypos + 1) * size])
+            self._chip_select.value = True
 
     def fill(self, bit_value: int) -> None:
         """
@@ -149,15 +233,19 @@ class MAX7219:
 
     def write_cmd(self, cmd: int, data: int) -> None:
         """
-        Writes a command to spi device.
+        Writes a command to spi device, every chip of a chain gets the same
+        command in a single write.
 
         :param int cmd: register address to write data to
         :param int data: data to be written to commanded register
         """
         # print('cmd {} data {}'.format(cmd,data))
-        self._chip_select.value = False
+        payload = self._cmd
+        for index in range(0, len(payload), 2):
+            payload[index] = cmd
+            payload[index + 1] = data
         with self._spi_device as my_spi_device:
-            my_spi_device.write(bytearray([cmd, data]))
+            my_spi_device.write(payload)
 
 
 class ChainableMAX7219(MAX7219):
@@ -192,32 +280,90 @@ class ChainableMAX7219(MAX7219):
         self._buffer = bytearray(self.chain_length * 8)
         self.framebuf = framebuf.FrameBuffer1(self._buffer, self.chain_length * 8, 8)
 
-    def write_cmd(self, cmd: int, data: int) -> None:
+
+class MAX7219Controller:
+    """
+    Refreshes several MAX7219 displays or chains that share the SCK and MOSI of
+    one SPI bus, each with its own chip select, e.g. a 7-segment bank and a
+    16x8 matrix. The bus is locked and configured once per refresh and each
+    display sends only its changed rows from its preallocated payloads.
+
+    :param ~busio.SPI spi: the spi busio or spi bitbangio object of the displays
+    :param int baudrate: for the spi bus baudrate (default 8000000)
+    :param int polarity: for the spi bus polarity (default 0)
+    :param int phase: for the spi bus phase (default 0)
+    """
+
+    def __init__(
+        self,
+        spi: busio.SPI,
+        *,
+        baudrate: int = 8000000,
+        polarity: int = 0,
+        phase: int = 0
+    ):
+        self._spi = spi
+        self._spi_config = {
+            "baudrate": baudrate,
+            "polarity": polarity,
+            "phase": phase,
+        }
+        self.displays = []
+
+    def add(self, display: MAX7219) -> MAX7219:
         """
-        Writes a command to spi device.
+        Adds a display to the refresh pass.
 
-        :param int cmd: register address to write data to
-        :param int data: data to be written to commanded register
+        :param MAX7219 display: a display created on the same spi bus
+        :return: the display
+        :rtype: MAX7219
         """
-        # print('cmd {} data {}'.format(cmd,data))
-        self._chip_select.value = False
-        with self._spi_device as my_spi_device:
-            for _ in range(self.chain_length):
-                my_spi_device.write(bytearray([cmd, data]))
+        if display._spi is not self._spi:  # pylint: disable=protected-access
+            raise ValueError("Display is on a different SPI bus")
+        if display not in self.displays:
+            self.displays.append(display)
+        return display
 
-    def show(self) -> None:
+    def remove(self, display: MAX7219) -> None:
         """
-        Updates the display.
+        Removes a display from the refresh pass.
+
+        :param MAX7219 display: the display to remove
         """
-        for ypos in range(8):
-            self._chip_select.value = False
-            with self._spi_device as my_spi_device:
-                for chip in range(self.chain_length):
-                    my_spi_device.write(
-                        bytearray(
-                            [
-                                _DIGIT0 + ypos,
-                                self._buffer[ypos * self.chain_length + chip],
-                            ]
-                        )
-                    )
+        self.displays.remove(display)
+
+    def show(self, force: bool = False) -> int:
+        """
+        Updates all the displays in one pass, only the changed rows are sent.
+
+        :param bool force: resend every row of every display (default False)
+        :return: the number of rows sent
+        :rtype: int
+        """
+        # pylint: disable=protected-access
+        pending = []
+        for display in self.displays:
+            rows = display._dirty_rows(force)
+            if rows:
+                pending.append((display, rows))
+        if not pending:
+            return 0
+        spi = self._spi
+        while not spi.try_lock():
+            pass
+        try:
+            spi.configure(**self._spi_config)
+            for display, rows in pending:
+                display._send_rows(spi, rows)
+        finally:
+            spi.unlock()
+        return sum(len(rows) for _, rows in pending)
+
+    def brightness(self, value: int) -> None:
+        """
+        Controls the brightness of all the displays.
+
+        :param int value: 0->15 dimmest to brightest
+        """
+        for display in self.displays:
+            display.brightness(value)
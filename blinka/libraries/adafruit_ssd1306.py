@@ -98,6 +98,8 @@ class _SSD1306(framebuf.FrameBuffer):
         else:
             self.pagebuffer = None
             self.page_column_start = None
+        # column and page window commands for Horizontal Addressing Mode
+        self._window = bytearray(6)
         # Let's get moving!
         self.poweron()
         self.init_display()
@@ -119,7 +121,7 @@ class _SSD1306(framebuf.FrameBuffer):
         #   96, 16:         0x60         0x02
         #   64, 48:         0x80         0x12
         #   64, 32:         0x80         0x12
-        for cmd in (
+        cmds = (
             SET_DISP,  # off
             # address setting
             SET_MEM_ADDR,
@@ -154,8 +156,8 @@ class _SSD1306(framebuf.FrameBuffer):
             SET_CHARGE_PUMP,
             0x10 if self.external_vcc else 0x14,
             SET_DISP | 0x01,  # display on
-        ):
-            self.write_cmd(cmd)
+        )
+        self.write_cmds(bytes(cmds))
         self.fill(0)
         self.show()
 
@@ -166,8 +168,7 @@ class _SSD1306(framebuf.FrameBuffer):
 
     def contrast(self, contrast: int) -> None:
         """Adjust the contrast"""
-        self.write_cmd(SET_CONTRAST)
-        self.write_cmd(contrast)
+        self.write_cmds(bytes((SET_CONTRAST, contrast)))
 
     def invert(self, invert: bool) -> None:
         """Invert all pixels on the display"""
@@ -180,7 +181,7 @@ class _SSD1306(framebuf.FrameBuffer):
         # com output (vertical mirror) is changed immediately
         # you need to call show() for the seg remap to be visible
 
-    def write_framebuf(self) -> None:
+    def write_framebuf(self, first: int = 0, last: Optional[int] = None) -> None:
         """Derived class must implement this"""
         raise NotImplementedError
 
@@ -188,6 +189,11 @@ class _SSD1306(framebuf.FrameBuffer):
         """Derived class must implement this"""
         raise NotImplementedError
 
+    def write_cmds(self, cmds: bytearray) -> None:
+        """Send a group of commands, derived classes can send them in one go"""
+        for cmd in cmds:
+            self.write_cmd(cmd)
+
     def poweron(self) -> None:
         "Reset device and turn on the display."
         if self.reset_pin:
@@ -203,21 +209,33 @@ class _SSD1306(framebuf.FrameBuffer):
     def show(self) -> None:
         """Update the display"""
         if not self.page_addressing:
-            xpos0 = 0
-            xpos1 = self.width - 1
-            if self.width != 128:
-                # narrow displays use centered columns
-                col_offset = (128 - self.width) // 2
-                xpos0 += col_offset
-                xpos1 += col_offset
-            self.write_cmd(SET_COL_ADDR)
-            self.write_cmd(xpos0)
-            self.write_cmd(xpos1)
-            self.write_cmd(SET_PAGE_ADDR)
-            self.write_cmd(0)
-            self.write_cmd(self.pages - 1)
+            self._set_window(0, self.pages - 1)
         self.write_framebuf()
 
+    def show_pages(self, first: int, last: int) -> None:
+        """Update only the 8 pixel high pages ``first`` to ``last`` (inclusive)"""
+        if not self.page_addressing:
+            self._set_window(first, last)
+        self.write_framebuf(first, last)
+
+    def _set_window(self, first: int, last: int) -> None:
+        """Set the column and page window for Horizontal Addressing Mode"""
+        xpos0 = 0
+        xpos1 = self.width - 1
+        if self.width != 128:
+            # narrow displays use centered columns
+            col_offset = (128 - self.width) // 2
+            xpos0 += col_offset
+            xpos1 += col_offset
+        window = self._window
+        window[0] = SET_COL_ADDR
+        window[1] = xpos0
+        window[2] = xpos1
+        window[3] = SET_PAGE_ADDR
+        window[4] = first
+        window[5] = last
+        self.write_cmds(window)
+
 
 class SSD1306_I2C(_SSD1306):
     """
@@ -253,6 +271,7 @@ class SSD1306_I2C(_SSD1306):
         # buffer).
         self.buffer = bytearray(((height // 8) * width) + 1)
         self.buffer[0] = 0x40  # Set first byte of data buffer to Co=0, D/C=1
+        self._pagedata = None  # control byte and pages of a partial update
         super().__init__(
             memoryview(self.buffer)[1:],
             width,
@@ -269,11 +288,13 @@ class SSD1306_I2C(_SSD1306):
         with self.i2c_device:
             self.i2c_device.write(self.temp)
 
-    def write_framebuf(self) -> None:
+    def write_framebuf(self, first: int = 0, last: Optional[int] = None) -> None:
         """Blast out the frame buffer using a single I2C transaction to support
         hardware I2C interfaces."""
+        if last is None:
+            last = self.pages - 1
         if self.page_addressing:
-            for page in range(self.pages):
+            for page in range(first, last + 1):
                 self.write_cmd(0xB0 + page)
                 self.write_cmd(self.page_column_start[0])
                 self.write_cmd(self.page_column_start[1])
@@ -282,9 +303,22 @@ class SSD1306_I2C(_SSD1306):
                 ]
                 with self.i2c_device:
                     self.i2c_device.write(self.pagebuffer)
-        else:
+        elif first == 0 and last == self.pages - 1:
             with self.i2c_device:
                 self.i2c_device.write(self.buffer)
+        else:
+            # the pages go out behind their own Co=0, D/C=1 control byte in a
+            # preallocated buffer, the framebuffer is never written to here
+            # so drawing from another thread cannot race the transfer
+            if self._pagedata is None:
+                self._pagedata = bytearray(len(self.buffer))
+                self._pagedata[0] = 0x40
+            size = self.width * (last + 1 - first)
+            self._pagedata[1 : 1 + size] = memoryview(self.buffer)[
+                1 + self.width * first : 1 + self.width * (last + 1)
+            ]
+            with self.i2c_device:
+                self.i2c_device.write(self._pagedata, end=1 + size)
 
 
 # pylint: disable-msg=too-many-arguments
@@ -329,6 +363,8 @@ class SSD1306_SPI(_SSD1306):
             spi, cs, baudrate=baudrate, polarity=polarity, phase=phase
         )
         self.dc_pin = dc
+        self._dc = 0  # last D/C level so the pin is only written on a change
+        self._cmd = bytearray(1)
         self.buffer = bytearray((height // 8) * width)
         super().__init__(
             memoryview(self.buffer),
@@ -339,14 +375,29 @@ class SSD1306_SPI(_SSD1306):
             page_addressing=self.page_addressing,
         )
 
+    def _set_dc(self, value: int) -> None:
+        """Drive the D/C pin, skipping the write when it is already at value"""
+        if self._dc != value:
+            self.dc_pin.value = value
+            self._dc = value
+
     def write_cmd(self, cmd: int) -> None:
         """Send a command to the SPI device"""
-        self.dc_pin.value = 0
+        self._cmd[0] = cmd
+        self.write_cmds(self._cmd)
+
+    def write_cmds(self, cmds: bytearray) -> None:
+        """Send a group of commands to the SPI device with one D/C toggle"""
+        self._set_dc(0)
         with self.spi_device as spi:
-            spi.write(bytearray([cmd]))
+            spi.write(cmds)
 
-    def write_framebuf(self) -> None:
+    def write_framebuf(self, first: int = 0, last: Optional[int] = None) -> None:
         """write to the frame buffer via SPI"""
-        self.dc_pin.value = 1
+        if last is None:
+            last = self.pages - 1
+        self._set_dc(1)
         with self.spi_device as spi:
-            spi.write(self.buffer)
+            spi.write(
+                memoryview(self.buffer)[self.width * first : self.width * (last + 1)]
+            )
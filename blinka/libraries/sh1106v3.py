@@ -500,37 +500,40 @@ class _SH1106:
 
     def init_display(self):
         """Base class to initialize display"""
-        for cmd in (
-            SET_DISP_OFF,  # Display Off
-            SET_DISP_CLK_DIV,
-            0xF0,  # Ratio
-            SET_MUX_RATIO,
-            0x3F,  # Multiplex
-            SET_DISP_OFFSET,
-            0x00,  # No offset
-            SET_DISP_START_LINE | 0x00,  # Start line
-            SET_CHARGE_PUMP,
-            0x10 if self.external_vcc else 0x14,  # Charge pump
-            SET_MEM_ADDR,
-            0x00,  # Memory mode, Horizontal
-            SET_PAGE_ADDRESS,  # Page address 0
-            SET_COMSCANDEC,  # COMSCANDEC
-            SET_LOW_COLUMN,  # SETLOWCOLUMN
-            SET_HIGH_COLUMN,  # SETHIGHCOLUMN
-            SET_COM_PIN_CFG,
-            0x02 if self.height == 32 else 0x12,  # SETCOMPINS
-            SET_CONTRAST,
-            0x9F if self.external_vcc else 0xCF,  # Contrast maximum
-            SET_SEG_REMAP,  # SET_SEGMENT_REMAP
-            SET_PRECHARGE,
-            0x22 if self.external_vcc else 0xF1,  # Pre Charge
-            SET_VCOM_DESEL,
-            0x20,  # VCOM Detect 0.77*Vcc
-            SET_ENTIRE_ON,  # DISPLAYALLON_RESUME
-            SET_NORM,  # NORMALDISPLAY
-            SET_DISP_ON,
-        ):  # on
-            self.write_cmd(cmd)
+        self.write_cmds(
+            bytes(
+                (
+                    SET_DISP_OFF,  # Display Off
+                    SET_DISP_CLK_DIV,
+                    0xF0,  # Ratio
+                    SET_MUX_RATIO,
+                    0x3F,  # Multiplex
+                    SET_DISP_OFFSET,
+                    0x00,  # No offset
+                    SET_DISP_START_LINE | 0x00,  # Start line
+                    SET_CHARGE_PUMP,
+                    0x10 if self.external_vcc else 0x14,  # Charge pump
+                    SET_MEM_ADDR,
+                    0x00,  # Memory mode, Horizontal
+                    SET_PAGE_ADDRESS,  # Page address 0
+                    SET_COMSCANDEC,  # COMSCANDEC
+                    SET_LOW_COLUMN,  # SETLOWCOLUMN
+                    SET_HIGH_COLUMN,  # SETHIGHCOLUMN
+                    SET_COM_PIN_CFG,
+                    0x02 if self.height == 32 else 0x12,  # SETCOMPINS
+                    SET_CONTRAST,
+                    0x9F if self.external_vcc else 0xCF,  # Contrast maximum
+                    SET_SEG_REMAP,  # SET_SEGMENT_REMAP
+                    SET_PRECHARGE,
+                    0x22 if self.external_vcc else 0xF1,  # Pre Charge
+                    SET_VCOM_DESEL,
+                    0x20,  # VCOM Detect 0.77*Vcc
+                    SET_ENTIRE_ON,  # DISPLAYALLON_RESUME
+                    SET_NORM,  # NORMALDISPLAY
+                    SET_DISP_ON,  # on
+                )
+            )
+        )
         self.fill(0)
         self.show()
 
@@ -540,8 +543,7 @@ class _SH1106:
 
     def contrast(self, contrast):
         """Adjust the contrast"""
-        self.write_cmd(SET_CONTRAST)
-        self.write_cmd(contrast)
+        self.write_cmds(bytes((SET_CONTRAST, contrast)))
 
     def invert(self, invert):
         """Invert all pixels on the display"""
@@ -550,7 +552,7 @@ class _SH1106:
         else:
             self.write_cmd(SET_NORM)
 
-    def write_framebuf(self):
+    def write_framebuf(self, first=0, last=None):
         """Derived class must implement this"""
         raise NotImplementedError
 
@@ -558,6 +560,11 @@ class _SH1106:
         """Derived class must implement this"""
         raise NotImplementedError
 
+    def write_cmds(self, cmds):
+        """Send a group of commands, derived classes can send them in one go"""
+        for cmd in cmds:
+            self.write_cmd(cmd)
+
     def poweron(self):
         "Reset device and turn on the display."
         if self.reset_pin:
@@ -573,6 +580,10 @@ class _SH1106:
         """Update the display"""
         self.write_framebuf()
 
+    def show_pages(self, first, last):
+        """Update only the 8 pixel high pages ``first`` to ``last`` (inclusive)"""
+        self.write_framebuf(first, last)
+
 
 class SH1106_I2C(_SH1106):
     """
@@ -599,6 +610,8 @@ class SH1106_I2C(_SH1106):
         # buffer).
         self.buffer = bytearray(((height // 8) * width) + 1)
         self.buffer[0] = 0x40  # Set first byte of data buffer to Co=0, D/C=1
+        self.pagebuffer = bytearray(width + 2)
+        self.pagebuffer[0] = 0x40  # Co = 0, D/C = 1
         framebuffer = FrameBuffer1(memoryview(self.buffer)[1:], width, height)
         super().__init__(framebuffer, width, height, external_vcc, reset)
 
@@ -609,28 +622,25 @@ class SH1106_I2C(_SH1106):
         self.i2c_bus.try_lock()
         self.i2c_bus.writeto(self.addr, self.temp)
 
-    def write_framebuf(self):
-        """write to the frame buffer via I2C"""
+    def write_framebuf(self, first=0, last=None):
+        """write the pages ``first`` to ``last`` of the frame buffer via I2C"""
+        if last is None:
+            last = (self.height // 8) - 1
 
         self.i2c_bus.try_lock()
         write = self.i2c_bus.writeto
         write_cmd = self.write_cmd
-        tmp_buf = bytearray(1)
-        tmp_buf[0] = 0x40  # Co = 0, D/C = 1
+        # preallocated page buffer with the Co = 0, D/C = 1 data byte prepended
+        local_buffer = self.pagebuffer
+        source = memoryview(self.buffer)
 
-        local_buffer = bytearray(self.width + 1)
-
-        for page in range(0, 8):  # Pages
-            page_mult = page << 7
+        for page in range(first, last + 1):  # Pages
+            page_mult = page * self.width
             write_cmd(0xB0 + page)  # set page address
             write_cmd(0x00)  # set lower column address
             write_cmd(0x10)  # set higher column address
 
-            # Not sure if there is a way to do this without a local buffer
-            # as we need to peprend a databyte onto the framebuffer data being sent.
-            local_buffer = self.buffer[page_mult : page_mult + self.width + 1]
-            local_buffer[:0] = tmp_buf  # prepend Co = 0, D/C = 1
-
+            local_buffer[1:] = source[page_mult : page_mult + self.width + 1]
             write(self.addr, local_buffer)
 
         self.i2c_bus.unlock()
@@ -673,30 +683,56 @@ class SH1106_SPI(_SH1106):
         self.spi_bus.configure(baudrate=baudrate, polarity=polarity, phase=phase)
         self.spi_bus.unlock()
         self.dc_pin = dc
+        self.cs_pin = cs
+        self._dc = 0  # last D/C level so the pin is only written on a change
+        self._cmd = bytearray(1)
+        # page address, lower and higher column address
+        self._page_cmd = bytearray((0xB0, 0x02, 0x10))
         self.buffer = bytearray((height // 8) * width)
         framebuffer = FrameBuffer1(self.buffer, width, height)
         super().__init__(framebuffer, width, height, external_vcc, reset)
 
+    def _set_dc(self, value):
+        """Drive the D/C pin, skipping the write when it is already at value"""
+        if self._dc != value:
+            self.dc_pin.value = value
+            self._dc = value
+
     def write_cmd(self, cmd):
         """Send a command to the SPI device"""
-        self.dc_pin.value = 0
+        self._cmd[0] = cmd
+        self.write_cmds(self._cmd)
+
+    def write_cmds(self, cmds):
+        """Send a group of commands to the SPI device with one D/C toggle"""
         self.spi_bus.try_lock()
-        self.spi_bus.write(bytearray([cmd]))
+        self._set_dc(0)
+        self.cs_pin.value = 0
+        self.spi_bus.write(cmds)
+        self.cs_pin.value = 1
+        self.spi_bus.unlock()
 
-    def write_framebuf(self):
-        """write to the frame buffer via SPI"""
+    def write_framebuf(self, first=0, last=None):
+        """write the pages ``first`` to ``last`` of the frame buffer via SPI\n
+        the bus is locked and selected once, each page is one command group
+        and one write straight from the frame buffer"""
+        if last is None:
+            last = (self.height // 8) - 1
 
         self.spi_bus.try_lock()
         spi_write = self.spi_bus.write
-        write = self.write_cmd
-
-        for page in range(0, 8):  # Pages
-            page_mult = page << 7
-            write(0xB0 + page)  # set page address
-            write(0x02)  # set lower column address
-            write(0x10)  # set higher column address
+        set_dc = self._set_dc
+        page_cmd = self._page_cmd
+        source = memoryview(self.buffer)
+        width = self.width
 
-            self.dc_pin.value = 1
-            spi_write(self.buffer, start=page_mult, end=page_mult + self.width)
+        self.cs_pin.value = 0
+        for page in range(first, last + 1):  # Pages
+            page_cmd[0] = 0xB0 + page  # set page address
+            set_dc(0)
+            spi_write(page_cmd)
+            set_dc(1)
+            spi_write(source[page * width : (page + 1) * width])
+        self.cs_pin.value = 1
 
         self.spi_bus.unlock()
@@ -13,6 +13,12 @@ import os
 import sys
 import time
 
+try:
+    from threading import RLock, Thread
+except ImportError:
+    # no threads under Circuitpython/Micropython
+    RLock = Thread = None
+
 # this environmental variable must be set, either in the code or from a terminal
 #  otherwise the U2IF device will not be detected for blinka
 # variation of https://github.com/adafruit/Adafruit_Blinka
@@ -46,6 +52,22 @@ except:
     print("ERR: No Raspberry Pico with U2IF firmware attached")
     exit()
 
+# the helpers live next to this file, imported here so they can also be
+# imported from xpander, E.g. from xpander import PixelStrip
+from xpander_analog import CIC, EMA, FIR, Calibration, Filter, Median, MovingAverage
+from xpander_lock import NoLock
+from xpander_oled import OLEDManager, oled_memory, show_oled_pages
+from xpander_pixels import (
+    HUES,
+    Animator,
+    PixelPipeline,
+    PixelStrip,
+    breathe,
+    chase,
+    rainbow,
+)
+from xpander_tasks import ADCtoPWM, PID, FixedRateTask, PWMPlayer, Servo
+
 
 # uart = usb_cdc.console
 # UART = usb_cdc.data
@@ -62,6 +84,10 @@ class Xpander:
     # - I2C
     SDA = board.SDA  # data out
     SCL = board.SCL  # data in
+    I2Cspeeds = (400_000, 800_000, 1_000_000)  # steps tried by setI2C("auto")
+    I2Ccache = ".xpander_i2c.json"  # in the home folder when there is one
+    CALfile = ".xpander_cal.json"  # analog calibrations, in the home folder too
+    CALchannels = ("IW0", "IW1", "IW2", "QW0", "QW1")
 
     # - SPI
     SPI_RX = board.MISO
@@ -78,7 +104,12 @@ class Xpander:
     OLEDw = 128  # assumed and not used
     OLEDh = 64
     OLEDlines = 6  # lines of text on the OLED
-    OLEDdata = [""] * OLEDlines
+    OLEDspacing = 10  # pixel spacing between the lines of text
+    OLEDpages = 8  # lines of text on the OLED with the page aligned layout
+    OLEDdata = [""] * OLEDpages
+
+    # WS2812b
+    _RGBoff = bytes(48)  # 16 x 3 GRB all off
 
     def __init__(self):
         self.LED: digitalio.DigitalInOut = digitalio.DigitalInOut(board.LED)
@@ -93,6 +124,31 @@ class Xpander:
 
         # assume no peripherals are set or attached
         self.UART = self.I2C = self.OLED = self.SPI = None
+        self.PIXELS = None
+        # colour correction for RGBshow
+        self.PIPELINE = PixelPipeline()
+        self.I2Cfrequency = 0
+        self.PWMfrequency = 0  # as last set by setPWM()
+        self.I2Caddresses = []
+        # text last rendered on each OLED line, None forces a full redraw
+        self._OLEDcache = None
+        self._OLEDaligned = False
+        self._OLEDfont = None  # font5x8.bin loaded for the page aligned text
+        # the lock of the USB link to the Pico, the Xpander methods hold it
+        # for their I/O, hold it too for direct pin access, E.g. GPIN[0].value,
+        # while players, loops, servos or OLED flushes run in threads
+        self.LOCK = RLock() if RLock else NoLock()
+        # registry of additional OLEDs sharing the I2C bus
+        self.OLEDS = OLEDManager(self.LOCK)
+        # duty cycle table players of the PWM outputs
+        self._PWMplayers = {}
+        self.ADCPWM = None  # ADC to PWM link, see setADCtoPWM()
+        self.PIDS = {}  # PID loops by PWM output, see setPID()
+        self.SERVOS = {}  # servos by PWM output, see setServo()
+        # calibrations of the analog channels by name, kept per Pico serial
+        self.CAL = self.loadCalibration()
+        # filters of the analog inputs by name, see setFilter()
+        self.FILTERS = {}
         self.setGPIO()
 
     def init_all(self):
@@ -110,6 +166,10 @@ class Xpander:
     def setPWM(self, freq=1000):
         """Initialise the PWM frequency and IO pins\n
             Both channels are set at the same time as they share the same PWM slice.
+            The firmware refuses a frequency change on one channel of a slice
+            while the other runs at another frequency, so both outputs are
+            created again, which stops the players, loops and links driving
+            them. Servos need 50Hz, stop them with stop_servo() first.
 
         Args:
             freq (int): set the PWM frequency 10 (10HZ) - 1_000_000 (1MHz)
@@ -117,64 +177,603 @@ class Xpander:
         try:
             freq = int(freq)
         except:
-            return
+            raise ValueError(f"PWM frequency must be a number, not {freq!r}") from None
 
         if freq < 10 or freq > 1_000_000:
-            return
-        if not self.QW0 is None:
-            self.QW0.deinit()
-        if not self.QW1 is None:
-            self.QW1.deinit()
-
-        print(
-            f"Initialising PWM to {freq}Hz on GP{board.AOUT0.id} & GP{board.AOUT1.id}"
-        )
-        try:
-            self.QW0 = pwmio.PWMOut(
-                board.AOUT0, duty_cycle=0, frequency=freq, variable_frequency=True
+            raise ValueError(f"PWM frequency must be 10Hz - 1MHz, not {freq}")
+        if self.SERVOS and freq != Servo.frequency:
+            raise ValueError(
+                f"Servos need the PWM at {Servo.frequency}Hz, call stop_servo() first"
             )
-            self.QW1 = pwmio.PWMOut(
-                board.AOUT1, duty_cycle=0, frequency=freq, variable_frequency=True
-            )
-        except:
+        self.stop_pwm()
+        if self.ADCPWM:
+            self.ADCPWM.stop()
+            self.ADCPWM = None
+        self.stop_pid()
+        self.stop_servo()
+        with self.LOCK:
+            if not self.QW0 is None:
+                self.QW0.deinit()
+            if not self.QW1 is None:
+                self.QW1.deinit()
+
             print(
-                f"Error setting the PWM to {freq}Hz on GP{board.AOUT0.id} & GP{board.AOUT1.id}"
+                f"Initialising PWM to {freq}Hz",
+                f"on GP{board.AOUT0.id} & GP{board.AOUT1.id}",
             )
-            self.AOUT0 = self.PWM0 = self.QW0 = None
-            self.AOUT1 = self.PWM1 = self.QW1 = None
-            return
+            try:
+                self.QW0 = pwmio.PWMOut(
+                    board.AOUT0, duty_cycle=0, frequency=freq, variable_frequency=True
+                )
+                self.QW1 = pwmio.PWMOut(
+                    board.AOUT1, duty_cycle=0, frequency=freq, variable_frequency=True
+                )
+            except:
+                print(
+                    f"Error setting the PWM to {freq}Hz",
+                    f"on GP{board.AOUT0.id} & GP{board.AOUT1.id}",
+                )
+                self.AOUT0 = self.PWM0 = self.QW0 = None
+                self.AOUT1 = self.PWM1 = self.QW1 = None
+                self.PWMfrequency = 0
+                return
         self.AOUT0 = self.PWM0 = self.QW0
         self.AOUT1 = self.PWM1 = self.QW1
+        self.PWMfrequency = freq
+
+    def play_pwm(self, channel: int, table, rate_hz: float, loop: bool = True):
+        """Play a table of duty cycles on AOUT0 or AOUT1\n
+            The table is stepped through at rate_hz from a background thread
+            paced by the monotonic clock, only the steps that change the duty
+            cycle are sent to the Pico. Playing on a channel that is already
+            playing swaps the table in at the start of the new table.
+            Without threads call the player's update() from the main loop.
+
+        Args:
+            channel (int): 0 for AOUT0, 1 for AOUT1
+            table (list): duty cycles 0-65535
+            rate_hz (float): steps per second
+            loop (bool): repeat the table. default True
+
+        Returns:
+            PWMPlayer: the player, to stop() or swap() the table
+        """
+        if not channel in (0, 1):
+            raise ValueError("channel must be 0 or 1")
+        if self.QW0 is None:
+            self.setPWM()
+        player = self._PWMplayers.get(channel)
+        if player is None:
+            self._release_output(channel)
+            pwm = self.QW0 if channel == 0 else self.QW1
+            player = PWMPlayer(pwm, table, rate_hz, loop, self.LOCK)
+            self._PWMplayers[channel] = player
+        else:
+            player.swap(table, rate_hz, loop)
+        if Thread:
+            player.start()
+        return player
+
+    def stop_pwm(self, channel: int = None):
+        """Stop playing a duty cycle table, the output keeps its last value
+
+        Args:
+            channel (int): 0 for AOUT0, 1 for AOUT1, None for both
+        """
+        for key in list(self._PWMplayers):
+            if channel is None or key == channel:
+                self._PWMplayers.pop(key).stop()
+
+    def setADCtoPWM(
+        self,
+        adc: int = 0,
+        outputs=(0, 1),
+        in_min: int = 0,
+        in_max: int = 65535,
+        out_min: int = 0,
+        out_max: int = 65535,
+        table=None,
+        rate_hz: float = 100,
+    ):
+        """Drive AOUT0 and/or AOUT1 from an ADC channel at a fixed rate\n
+            The ADC value is mapped as map_range(value, in_min, in_max,
+            out_min, out_max) clamped to the output range, or through a table
+            of duty cycles spread over the ADC range. The link runs in a
+            background thread, adjust it with set_linear()/set_table() and
+            read its telemetry(). Without threads call its tick() from the
+            main loop.
+
+        Args:
+            adc (int): 0 for IW0/ADC0, 1 for IW1/ADC1, 2 for IW2/ADC2
+            outputs (tuple): PWM outputs to drive, 0 for AOUT0, 1 for AOUT1
+            in_min (int): low end of the ADC range. default 0
+            in_max (int): upper end of the ADC range. default 65535
+            out_min (int): duty cycle at in_min. default 0
+            out_max (int): duty cycle at in_max. default 65535
+            table (list): duty cycles to use instead of the linear mapping
+            rate_hz (float): updates per second. default 100
+
+        Returns:
+            ADCtoPWM: the link, also in ADCPWM
+        """
+        source = getattr(self, f"IW{adc}", None)
+        if source is None:
+            raise ValueError(f"ADC{adc} is not available")
+        if self.QW0 is None:
+            self.setPWM()
+        if self.ADCPWM:
+            self.ADCPWM.stop()
+            self.ADCPWM = None
+        for output in outputs:
+            self._release_output(output)
+        pwms = [self.QW0 if output == 0 else self.QW1 for output in outputs]
+        self.ADCPWM = ADCtoPWM(source, pwms, rate_hz, self.LOCK)
+        if table is None:
+            self.ADCPWM.set_linear(in_min, in_max, out_min, out_max)
+        else:
+            self.ADCPWM.set_table(table)
+        if Thread:
+            self.ADCPWM.start()
+        return self.ADCPWM
+
+    def setPID(
+        self,
+        output: int = 0,
+        adc: int = 0,
+        kp: float = 1.0,
+        ki: float = 0.0,
+        kd: float = 0.0,
+        setpoint: float = 32768,
+        rate_hz: float = 100,
+    ):
+        """Control AOUT0 or AOUT1 from an ADC channel with a PID loop\n
+            E.g. hold a light level measured by an LDR on ADC0 with a lamp on
+            AOUT0. The loop runs at a fixed rate in a background thread, each
+            tick reads the ADC once and writes the PWM once. Tune it with the
+            PID attributes and read its stats(). Without threads call its
+            tick() from the main loop.
+
+        Args:
+            output (int): 0 for AOUT0, 1 for AOUT1
+            adc (int): 0 for IW0/ADC0, 1 for IW1/ADC1, 2 for IW2/ADC2
+            kp (float): proportional gain. default 1
+            ki (float): integral gain, per second. default 0
+            kd (float): derivative gain, in seconds. default 0
+            setpoint (float): ADC value to hold. default 32768
+            rate_hz (float): ticks per second. default 100
+
+        Returns:
+            PID: the loop, also in PIDS[output]
+        """
+        if not output in (0, 1):
+            raise ValueError("output must be 0 or 1")
+        source = getattr(self, f"IW{adc}", None)
+        if source is None:
+            raise ValueError(f"ADC{adc} is not available")
+        if self.QW0 is None:
+            self.setPWM()
+        self._release_output(output)
+        pwm = self.QW0 if output == 0 else self.QW1
+        pid = PID(
+            kp,
+            ki,
+            kd,
+            setpoint,
+            rate_hz=rate_hz,
+            adc=source,
+            pwm=pwm,
+            lock=self.LOCK,
+        )
+        self.PIDS[output] = pid
+        if Thread:
+            pid.start()
+        return pid
+
+    def stop_pid(self, output: int = None):
+        """Stop a PID loop, the output keeps its last value
+
+        Args:
+            output (int): 0 for AOUT0, 1 for AOUT1, None for both
+        """
+        for key in list(self.PIDS):
+            if output is None or key == output:
+                self.PIDS.pop(key).stop()
+
+    def setServo(
+        self,
+        output: int = 0,
+        min_pulse: int = 500,
+        max_pulse: int = 2500,
+        actuation_range: float = 180,
+    ):
+        """Drive a hobby servo from AOUT0 or AOUT1\n
+            The PWM is set to 50Hz, shared by both outputs. Set the servo's
+            angle or pulse_width directly or move it with a trapezoidal or
+            S-curve motion profile with move_to(), the profile is stepped
+            from a background thread. Without threads call its tick() from
+            the main loop.
+
+        Args:
+            output (int): 0 for AOUT0, 1 for AOUT1
+            min_pulse (int): pulse width at 0 degrees in us. default 500
+            max_pulse (int): pulse width at actuation_range in us. default 2500
+            actuation_range (float): degrees of travel. default 180
+
+        Returns:
+            Servo: the servo, also in SERVOS[output]
+        """
+        if not output in (0, 1):
+            raise ValueError("output must be 0 or 1")
+        # the frequency read back from the PWM may not be exactly 50Hz
+        if self.QW0 is None or self.PWMfrequency != Servo.frequency:
+            self.setPWM(Servo.frequency)
+        self._release_output(output)
+        pwm = self.QW0 if output == 0 else self.QW1
+        servo = Servo(
+            pwm,
+            min_pulse=min_pulse,
+            max_pulse=max_pulse,
+            actuation_range=actuation_range,
+            lock=self.LOCK,
+        )
+        self.SERVOS[output] = servo
+        return servo
+
+    def stop_servo(self, output: int = None):
+        """Stop driving a servo, it holds its last position
+
+        Args:
+            output (int): 0 for AOUT0, 1 for AOUT1, None for both
+        """
+        for key in list(self.SERVOS):
+            if output is None or key == output:
+                self.SERVOS.pop(key).stop()
+
+    def _release_output(self, output: int):
+        """Stop whatever drives AOUT0 or AOUT1, an output has only one driver
+
+        Args:
+            output (int): 0 for AOUT0, 1 for AOUT1
+        """
+        self.stop_pwm(output)
+        self.stop_pid(output)
+        self.stop_servo(output)
+        pwm = self.QW0 if output == 0 else self.QW1
+        if self.ADCPWM and pwm in self.ADCPWM.pwms:
+            self.ADCPWM.stop()
+            self.ADCPWM = None
 
     def setSPI(self):
         """Initialiase the SPI on GP2,GP3,GP4,GP5"""
         print(
             f"Initialising SPI to GP{board.SCLK.id}, GP{board.MISO.id} & GP{board.MOSI.id}"
         )
-        self.SPI_CS = digitalio.DigitalInOut(self.SPI_CS)
+        with self.LOCK:
+            self.SPI_CS = digitalio.DigitalInOut(self.SPI_CS)
+            try:
+                self.SPI = busio.SPI(self.SPI_SCK, MOSI=self.SPI_TX, MISO=self.SPI_RX)
+            except:
+                print("No SPI devices found")
+                self.SPI = None
+
+    def setI2C(self, frequency=400_000):
+        """Initialise the I2C on GP0,GP1 @ 400KHz\n
+            "auto" steps the frequency up through 400KHz, 800KHz and 1MHz,
+            checking the attached devices still acknowledge at each step, and
+            keeps the fastest reliable one. The result is cached per Pico
+            serial number so later startups skip the probing.
+            The OLEDs already set up are moved over to the new I2C object.
+
+        Args:
+            frequency (int|str): I2C frequency in Hz or "auto". default 400KHz
+        """
+        if frequency == "auto":
+            self._autoI2C()
+            return
+        if not isinstance(frequency, int) or not 10_000 <= frequency <= 1_000_000:
+            raise ValueError(
+                f"I2C frequency must be 10KHz - 1MHz in Hz or 'auto', not {frequency!r}"
+            )
+        with self.LOCK:
+            if not self.I2C is None:
+                self.I2C.deinit()
+            print(
+                f"Initialising the I2C on GP{board.SCL.id},GP{board.SDA.id}",
+                f"@ {frequency // 1000}KHz",
+            )
+            try:
+                self.I2C = busio.I2C(self.SCL, self.SDA, frequency=frequency)
+                poll = 0
+                while not self.I2C.try_lock() and poll < 10:
+                    poll += 1
+                self.I2Caddresses = self.I2C.scan()
+                print(
+                    "I2C addresses found:",
+                    [hex(device_address) for device_address in self.I2Caddresses],
+                )
+                self.I2C.unlock()
+                self.I2Cfrequency = frequency
+                oleds = [self.OLEDS[name] for name in self.OLEDS.names()]
+                for oled in [self.OLED] + oleds:
+                    if oled:
+                        self._rebindOLED(oled)
+
+            except:
+                self.I2C = None
+                self.I2Caddresses = []
+                print("No I2C device attached")
+
+    def _rebindOLED(self, oled):
+        """Point an OLED driver at the current I2C object
+
+        Args:
+            oled: SH1106_I2C or SSD1306_I2C driver
+        """
+        if hasattr(oled, "i2c_bus"):
+            oled.i2c_bus = self.I2C
+        else:
+            # pylint: disable=import-outside-toplevel
+            from adafruit_bus_device.i2c_device import I2CDevice
+
+            oled.i2c_device = I2CDevice(self.I2C, oled.addr, probe=False)
+
+    def _autoI2C(self):
+        """Find the fastest I2C frequency the attached devices handle reliably"""
+        serial = self._serial()
+        # without a serial number the result cannot be told apart per Pico
+        cache = self._loadI2Ccache() if serial else {}
+        cached = cache.get(serial)
+        if isinstance(cached, int) and 10_000 <= cached <= 1_000_000:
+            self.setI2C(cached)
+            if self.I2C and self._checkI2C(self.I2Caddresses):
+                return
+            print("- cached I2C frequency failed, probing again")
+
+        self.setI2C(self.I2Cspeeds[0])
+        if not self.I2C:
+            return
+        expected = self.I2Caddresses
+        if not expected:
+            # nothing attached to verify against so stay at the default
+            return
+        best = self.I2Cspeeds[0] if self._checkI2C(expected) else 100_000
+        if best == self.I2Cspeeds[0]:
+            for frequency in self.I2Cspeeds[1:]:
+                self.setI2C(frequency)
+                if not (self.I2C and self._checkI2C(expected)):
+                    break
+                best = frequency
+        if self.I2Cfrequency != best or not self.I2C:
+            self.setI2C(best)
+        print(f"- using the I2C @ {best // 1000}KHz")
+        if serial:
+            cache[serial] = best
+            self._saveI2Ccache(cache)
+
+    def _checkI2C(self, expected: list) -> bool:
+        """Check the expected devices acknowledge at the current I2C frequency\n
+            The OLEDs are sent a burst of NOP commands as the test pattern,
+            every byte of which has to be acknowledged.
+
+        Args:
+            expected (list): I2C addresses that must be found
+
+        Returns:
+            bool: True when every device responded correctly
+        """
+        pattern = bytes([0x00] + [0xE3] * 32)  # Co = 0, D/C = 0 then NOPs
+        with self.LOCK:
+            for _ in range(10):
+                if self.I2C.try_lock():
+                    break
+            else:
+                # someone else holds the bus, do not release their lock
+                return False
+            try:
+                if self.I2C.scan() != expected:
+                    return False
+                for addr in expected:
+                    if addr in (0x3C, 0x3D):
+                        for _ in range(4):
+                            self.I2C.writeto(addr, pattern)
+            except:
+                return False
+            finally:
+                self.I2C.unlock()
+            return True
+
+    def _serial(self) -> str:
+        """Serial number of the attached Pico, used to key the I2C cache
+
+        Returns:
+            str: the serial number, None when it cannot be read
+        """
         try:
-            self.SPI = busio.SPI(self.SPI_SCK, MOSI=self.SPI_TX, MISO=self.SPI_RX)
+            # pylint: disable=import-outside-toplevel,protected-access
+            from adafruit_blinka.microcontroller.rp2040_u2if.rp2040_u2if import (
+                rp2040_u2if,
+            )
+
+            return rp2040_u2if._hid.get_serial_number_string()
+        except:
+            pass
+        try:
+            import microcontroller
+
+            return microcontroller.cpu.uid.hex()
         except:
-            print("No SPI devices found")
-            self.SPI = None
+            return None
+
+    def _I2Ccachefile(self) -> str:
+        """Path of the I2C frequency cache file"""
+        return self._homefile(self.I2Ccache)
 
-    def setI2C(self):
-        """Initialise the I2C on GP0,GP1 @ 400KHz"""
-        print(f"Initialising the I2C on GP{board.SCL.id},GP{board.SDA.id} @ 400KHz")
+    def _homefile(self, name: str) -> str:
+        """Path of a settings file in the home folder, or the root without one"""
         try:
-            self.I2C = busio.I2C(self.SCL, self.SDA, frequency=400_000)
-            poll = 0
-            while not self.I2C.try_lock() and poll < 10:
-                poll += 1
-            print(
-                "I2C addresses found:",
-                [hex(device_address) for device_address in self.I2C.scan()],
+            return os.path.join(os.path.expanduser("~"), name)
+        except:
+            return "/" + name
+
+    def _loadI2Ccache(self) -> dict:
+        """Read the I2C frequencies found for each Pico serial number"""
+        try:
+            import json
+
+            with open(self._I2Ccachefile(), "r") as cache:
+                return json.load(cache)
+        except:
+            return {}
+
+    def _saveI2Ccache(self, cache: dict):
+        """Save the I2C frequencies found for each Pico serial number"""
+        try:
+            import json
+
+            with open(self._I2Ccachefile(), "w") as file:
+                json.dump(cache, file)
+        except:
+            print("- unable to save the I2C frequency cache")
+
+    def setCalibration(self, channel: str, calibration, save: bool = True):
+        """Set the calibration of an analog channel\n
+            IW0-IW2 calibrations map the ADC value to the value read with
+            readAnalog(), QW0-QW1 calibrations map the value written with
+            writeAnalog() to the duty cycle.
+
+        Args:
+            channel (str): "IW0", "IW1", "IW2", "QW0" or "QW1"
+            calibration (Calibration): the mapping, None to remove it
+            save (bool): save the calibrations for this Pico. default True
+        """
+        if not channel in self.CALchannels:
+            raise ValueError(f"channel must be one of {self.CALchannels}")
+        if calibration is None:
+            self.CAL.pop(channel, None)
+        else:
+            self.CAL[channel] = calibration
+        if save:
+            self.saveCalibration()
+
+    def readAnalog(self, channel: str = "IW0") -> int:
+        """Read an analog input through its calibration
+
+        Args:
+            channel (str): "IW0", "IW1" or "IW2". default "IW0"
+
+        Returns:
+            int: the calibrated value, the raw ADC value without calibration
+        """
+        adc = getattr(self, channel, None) if channel in self.CALchannels[:3] else None
+        if adc is None:
+            raise ValueError(f"{channel} is not an available analog input")
+        with self.LOCK:
+            value = adc.value
+        calibration = self.CAL.get(channel)
+        return calibration.map(value) if calibration else value
+
+    def writeAnalog(self, channel: str, value: int):
+        """Write an analog output through its calibration
+
+        Args:
+            channel (str): "QW0" or "QW1"
+            value (int): the value to output, the duty cycle without calibration
+        """
+        pwm = getattr(self, channel, None) if channel in self.CALchannels[3:] else None
+        if pwm is None:
+            raise ValueError(
+                f"{channel} is not an available analog output, see setPWM()"
             )
-            self.I2C.unlock()
+        calibration = self.CAL.get(channel)
+        with self.LOCK:
+            pwm.duty_cycle = calibration.map(value) if calibration else value
+
+    def convertAnalog(self, channel: str, values):
+        """Map a block of values through the calibration of a channel\n
+            E.g. a burst of ADC readings. See Calibration.apply()
+
+        Args:
+            channel (str): "IW0", "IW1", "IW2", "QW0" or "QW1"
+            values: array, list or numpy array of 0-65535 values
+
+        Returns:
+            the mapped values, a numpy array for numpy input else an array
+        """
+        if channel not in self.CALchannels or getattr(self, channel, None) is None:
+            raise ValueError(f"{channel} is not an available analog channel")
+        calibration = self.CAL.get(channel)
+        if calibration is None:
+            return values
+        return calibration.apply(values)
+
+    def setFilter(self, channel: str, stage):
+        """Attach a filter to an analog input, see readFiltered()
+
+        Args:
+            channel (str): "IW0", "IW1" or "IW2"
+            stage (Filter): E.g. MovingAverage(8), None to remove the filter
+        """
+        if not channel in self.CALchannels[:3]:
+            raise ValueError(f"channel must be one of {self.CALchannels[:3]}")
+        if stage is None:
+            self.FILTERS.pop(channel, None)
+        else:
+            self.FILTERS[channel] = stage
 
+    def readFiltered(self, channel: str = "IW0"):
+        """Read an analog input once and pass it through its filter\n
+            Call once per scan, the filter keeps its history between calls.
+
+        Args:
+            channel (str): "IW0", "IW1" or "IW2". default "IW0"
+
+        Returns:
+            the filtered value, the latest output of a decimating filter
+        """
+        value = self.readAnalog(channel)
+        stage = self.FILTERS.get(channel)
+        if stage is None:
+            return value
+        stage.update(value)
+        return stage.value
+
+    def loadCalibration(self) -> dict:
+        """Read the calibrations saved for the attached Pico
+
+        Returns:
+            dict: Calibration by channel name
+        """
+        try:
+            import json
+
+            with open(self._homefile(self.CALfile), "r") as file:
+                saved = json.load(file).get(self._serial(), {})
+            return {
+                channel: Calibration.from_dict(calibration)
+                for channel, calibration in saved.items()
+            }
         except:
-            self.I2C = None
-            print("No I2C device attached")
+            return {}
+
+    def saveCalibration(self):
+        """Save the calibrations for the attached Pico, others are kept"""
+        try:
+            import json
+
+            path = self._homefile(self.CALfile)
+            try:
+                with open(path, "r") as file:
+                    saved = json.load(file)
+            except:
+                saved = {}
+            saved[self._serial()] = {
+                channel: calibration.to_dict()
+                for channel, calibration in self.CAL.items()
+            }
+            with open(path, "w") as file:
+                json.dump(saved, file)
+        except:
+            print("- unable to save the analog calibrations")
 
     def setUART(self, baud=115200):
         """Initialiase the UART on GP4,GP5 @ 115200 baud
@@ -183,9 +782,6 @@ class Xpander:
         Args:
             baud (int): UART baud rate 75 to 128000
         """
-        print(f"Initialising UART to {baud} baud on GP{board.TX.id} & GP{board.RX.id}")
-        if not isinstance(baud, int):
-            return
         # range based off windows COM settings
         if not baud in (
             75,
@@ -208,12 +804,14 @@ class Xpander:
             115200,
             128000,
         ):
-            return
-        try:
-            self.UART = busio.UART(self.TX, self.RX, baudrate=115200, timeout=1)
-        except:
-            print("No UART capability found")
-            self.UART = None
+            raise ValueError(f"{baud!r} is not a supported UART baud rate")
+        print(f"Initialising UART to {baud} baud on GP{board.TX.id} & GP{board.RX.id}")
+        with self.LOCK:
+            try:
+                self.UART = busio.UART(self.TX, self.RX, baudrate=115200, timeout=1)
+            except:
+                print("No UART capability found")
+                self.UART = None
 
     def setGPIO(self):
         """Initialiase the I/O on GP6-GP13 for input and GP14-GP21 for output\n
@@ -245,15 +843,16 @@ class Xpander:
         ]
 
         print(f"Initialising the GPIO on GP6-GP13 for input and GP14-GP21 for output")
-        for v in range(8):
-            # create output pins
-            self.GPOUT[v] = digitalio.DigitalInOut(opins[v])
-            self.GPOUT[v].direction = digitalio.Direction.OUTPUT
-            self.GPOUT[v].value = False
-            # create input pins
-            self.GPIN[v] = digitalio.DigitalInOut(ipins[v])
-            self.GPIN[v].direction = digitalio.Direction.INPUT
-            self.GPIN[v].pull = digitalio.Pull.DOWN
+        with self.LOCK:
+            for v in range(8):
+                # create output pins
+                self.GPOUT[v] = digitalio.DigitalInOut(opins[v])
+                self.GPOUT[v].direction = digitalio.Direction.OUTPUT
+                self.GPOUT[v].value = False
+                # create input pins
+                self.GPIN[v] = digitalio.DigitalInOut(ipins[v])
+                self.GPIN[v].direction = digitalio.Direction.INPUT
+                self.GPIN[v].pull = digitalio.Pull.DOWN
 
         self.QX0: digitalio.DigitalInOut = self.GPOUT[0]
         self.QX1: digitalio.DigitalInOut = self.GPOUT[1]
@@ -273,20 +872,56 @@ class Xpander:
         self.IX6: digitalio.DigitalInOut = self.GPIN[6]
         self.IX7: digitalio.DigitalInOut = self.GPIN[7]
 
-    def setOLED(self, is32: bool = False):
+    def setOLED(self, is32: bool = False, addr: int = 0x3C):
         """Initialiase the OLED on the I2C
             SH1106 OLED with 128x64 resolution.
             Supports the 0.96", 1.54" or 2.42" OLED with pixel heigh 64\n
             0.91" with pixel height 32 uses the adafruit_SSD1306 driver.
         Args:
             is32 (bool): True for 32 pixel heigh. default False
+            addr (int): I2C address of the OLED. default 0x3C
         """
         if not self.I2C:
             self.setI2C()
 
         if not self.OLED is None:
             del self.OLED
+        self._OLEDcache = None
         print(f"Initialising the 128x{32 if is32 else 64} OLED on I2C0")
+        self.OLED = self._newOLED(is32, addr)
+
+    def addOLED(self, name: str, is32: bool = False, addr: int = 0x3D, fps=10):
+        """Add another OLED on the shared I2C to the OLEDS registry\n
+            The OLEDS are refreshed together with OLEDS.flush()
+
+        Args:
+            name (str): name to look the OLED up with, E.g. OLEDS["status"]
+            is32 (bool): True for 32 pixel heigh. default False
+            addr (int): I2C address of the OLED. default 0x3D
+            fps (int): maximum refresh rate of this OLED. default 10
+
+        Returns:
+            the OLED driver or None if no OLED was found
+        """
+        if not self.I2C:
+            self.setI2C()
+
+        print(f"Adding the 128x{32 if is32 else 64} OLED {name} @ {hex(addr)}")
+        oled = self._newOLED(is32, addr)
+        if oled:
+            self.OLEDS.add(name, oled, fps)
+        return oled
+
+    def _newOLED(self, is32: bool, addr: int):
+        """Create the OLED driver based on the OLED pixel height
+
+        Args:
+            is32 (bool): True for 32 pixel heigh
+            addr (int): I2C address of the OLED
+
+        Returns:
+            the OLED driver or None if no OLED was found
+        """
 
         # only import the relevant OLED driver based on the OLED pixel height
         try:
@@ -294,43 +929,139 @@ class Xpander:
                 #  For the 0.91" OLED with pixel heigh 32
                 import adafruit_ssd1306
 
-                self.OLED = adafruit_ssd1306.SSD1306_I2C(128, 32, self.I2C, addr=0x3C)
+                with self.LOCK:
+                    oled = adafruit_ssd1306.SSD1306_I2C(128, 32, self.I2C, addr=addr)
                 print("- Using the 0.91 OLED driver")
             else:
                 # For the 0.96", 1.54" or 2.42" OLED with pixel heigh 64
                 # use version 3 of the driver that does not require adafruit_framebuf
                 import sh1106v3 as sh1106
 
-                self.OLED = sh1106.SH1106_I2C(128, 64, self.I2C, addr=0x3C)
+                with self.LOCK:
+                    oled = sh1106.SH1106_I2C(128, 64, self.I2C, addr=addr)
                 print("- using the 0.96, 1.54 or 2.42 sh1106v3 OLED driver")
         except:
-            self.OLED = None
+            oled = None
             print("No OLED attached")
+        return oled
 
     # display 1 or more lines of text from a list onto the OLED
-    def display(self, strs: list):
-        """Send 1-6 strings to the OLED display assuming the 128x64 device
+    def display(self, strs: list, aligned: bool = False):
+        """Send 1-6 strings to the OLED display assuming the 128x64 device\n
+            Only the lines whose text changed since the last call are redrawn
+            and sent to the OLED, nothing is sent if the text is identical.\n
+            The aligned layout places 8 lines (4 on the 128x32) on the 8 pixel
+            pages of the OLED so each changed line is a single page write.
 
         Args:
-            strs (list): List of 1-6 strings
+            strs (list): List of 1-6 strings, 1-8 when aligned
+            aligned (bool): True for the page aligned layout. default False
         """
 
         if not self.OLED:
             return
         if not isinstance(strs, list):
             return
-        if len(strs) > self.OLEDlines:
-            strs = strs[: self.OLEDlines]
-        self.OLED.fill(False)
+        if aligned:
+            nlines = self.OLED.height // 8
+            spacing = 8
+        else:
+            nlines = self.OLEDlines
+            spacing = self.OLEDspacing
+        if len(strs) > nlines:
+            strs = strs[:nlines]
+
+        # the text each line should show, lines not passed in are blanked
+        lines = [""] * nlines
         for k, v in enumerate(strs):
-            try:
-                # save updated line
-                if isinstance(v, str) and len(v) > 0:
-                    self.OLEDdata[k] = v
-                self.OLED.text(self.OLEDdata[k], 0, k * 10, 1)
-            except:
+            # save updated line
+            if isinstance(v, str) and len(v) > 0:
+                self.OLEDdata[k] = v
+            lines[k] = self.OLEDdata[k]
+
+        if self._OLEDaligned != aligned:
+            self._OLEDcache = None
+        self._OLEDaligned = aligned
+        try:
+            if self._OLEDcache is None:
+                # unknown screen contents so redraw everything
+                self.OLED.fill(False)
+                for k, v in enumerate(lines):
+                    if aligned:
+                        self._text_page(k, v)
+                    else:
+                        self.OLED.text(v, 0, k * spacing, 1)
+                with self.LOCK:
+                    self.OLED.show()
+                self._OLEDcache = lines
                 return
-        self.OLED.show()
+
+            dirty = []
+            for k, v in enumerate(lines):
+                if v == self._OLEDcache[k]:
+                    continue
+                if aligned:
+                    self._text_page(k, v)
+                    dirty.append(k)
+                    continue
+                y = k * spacing
+                if y >= self.OLED.height:
+                    continue
+                self.OLED.fill_rect(0, y, self.OLED.width, spacing, 0)
+                self.OLED.text(v, 0, y, 1)
+                # the 8 pixel high pages the line touches
+                last_row = min(y + spacing, self.OLED.height) - 1
+                for page in range(y >> 3, (last_row >> 3) + 1):
+                    if not page in dirty:
+                        dirty.append(page)
+            self._OLEDcache = lines
+            self._show_pages(dirty)
+        except:
+            self._OLEDcache = None
+            return
+
+    def _text_page(self, page: int, text: str):
+        """Render a line of text straight into one 8 pixel page of the OLED
+            framebuffer by copying the font column bytes, no pixel plotting.
+
+        Args:
+            page (int): page number (line) to render into
+            text (str): line of text
+        """
+        if self._OLEDfont is None:
+            try:
+                with open("font5x8.bin", "rb") as font:
+                    self._OLEDfont = memoryview(font.read())
+            except OSError:
+                self._OLEDfont = False
+        width = self.OLED.width
+        if not self._OLEDfont or self._OLEDfont[1] != 8:
+            # no usable font file, fall back to the framebuffer text
+            self.OLED.fill_rect(0, page * 8, width, 8, 0)
+            self.OLED.text(text, 0, page * 8, 1)
+            return
+
+        font = self._OLEDfont
+        fwidth = font[0]
+        buf = oled_memory(self.OLED)
+        base = page * width
+        buf[base : base + width] = bytes(width)
+        x = 0
+        for char in text:
+            if x + fwidth > width:
+                break
+            glyph = 2 + (ord(char) & 0xFF) * fwidth
+            buf[base + x : base + x + fwidth] = font[glyph : glyph + fwidth]
+            x += fwidth + 1
+
+    def _show_pages(self, pages: list):
+        """Send the given OLED pages, grouping neighbouring pages into one write
+
+        Args:
+            pages (list): page numbers to send
+        """
+        with self.LOCK:
+            show_oled_pages(self.OLED, pages)
 
     def testOLED(self):
         """Print a test message on the OLED"""
@@ -339,35 +1070,59 @@ class Xpander:
         if not self.OLED:
             return
 
+        self._OLEDcache = None
         self.OLED.fill(False)
         self.OLED.text("Hello world!", 0, 0, 1)
         self.OLED.text("picoXpander", 0, 10, 1)
         self.OLED.text("Version 1.0", 0, 20, 1)
-        self.OLED.show()
+        with self.LOCK:
+            self.OLED.show()
 
     def RGBon(self, buffer):
         """Turn on an array of WS2812b/Neopixels
             Up to 16 GRB leds supported.
             Board driver can support up to 1000
 
+            bytes, bytearray, memoryview, array('B') and numpy uint8 buffers
+            are sent as they are, bytes can't be out of range so there is
+            nothing to check. Lists and wider buffers, E.g. a float numpy
+            array after a brightness multiply, are copied with their values
+            saturated to 0-255, the caller's buffer is left unchanged.
+
         Args:
-            buffer (list): 16 x 3 GRB byte values
+            buffer: 16 x 3 GRB byte values
         """
 
         # 16 x 3 GRB
-        if not isinstance(buffer, list):
-            return
-        # clip the buffer
-        if len(buffer) > 48:
+        if isinstance(buffer, (bytes, bytearray)):
+            if len(buffer) > 48:
+                buffer = memoryview(buffer)[:48]
+        elif isinstance(buffer, list):
+            buffer = bytes(_colour_byte(value) for value in buffer[:48])
+        else:
+            try:
+                buffer = memoryview(buffer)
+            except TypeError:
+                return
+            if buffer.ndim != 1:
+                # E.g. a numpy array of (led, colour) rows, flattened
+                try:
+                    flat = buffer.cast("B")
+                    buffer = flat if buffer.itemsize == 1 else flat.cast(buffer.format)
+                except (TypeError, ValueError):
+                    raise ValueError(
+                        "RGBon needs a flat or C contiguous buffer"
+                    ) from None
+            if buffer.itemsize != 1 or buffer.format == "b":
+                # wider or signed values, E.g. a numpy int or float array
+                buffer = bytes(_colour_byte(value) for value in buffer[:48].tolist())
+            elif buffer.format != "B":
+                # E.g. chars
+                buffer = buffer.cast("B")
             buffer = buffer[:48]
-        # clip large values to 1byte
-        for i in range(len(buffer)):
-            if isinstance(buffer[i], int):
-                buffer[i] = buffer[i] & 0xFF
-            else:
-                buffer[i] = 0
 
-        neopixel_write.neopixel_write(self.ONEWIRE, buffer)
+        with self.LOCK:
+            neopixel_write.neopixel_write(self.ONEWIRE, buffer)
 
     def RGBoff(self):
         """Turn off the WS281b leds - up to 16 of them
@@ -378,8 +1133,39 @@ class Xpander:
             None
         """
 
-        buffer = [0] * 48
-        neopixel_write.neopixel_write(self.ONEWIRE, buffer)
+        with self.LOCK:
+            neopixel_write.neopixel_write(self.ONEWIRE, self._RGBoff)
+
+    def RGBshow(self, frame):
+        """Turn on the WS2812b/Neopixels from RGB(W) values\n
+            The frame is colour corrected and reordered by PIPELINE, then
+            sent to the PIXELS strip when there is one, else to RGBon.
+            PIXELS only drives 3 colour leds, E.g. "GRB", not "GRBW".
+
+        Args:
+            frame: RGB(W) byte values, see PixelPipeline
+        """
+        if self.PIXELS is None:
+            self.RGBon(self.PIPELINE(frame))
+            return
+        if len(self.PIPELINE.order) != 3:
+            raise ValueError(
+                f"PIXELS drives 3 colour leds, not the {self.PIPELINE.order} order"
+            )
+        self.PIXELS.show(self.PIPELINE(frame))
+
+    def setPixels(self, count: int):
+        """Initialise a WS2812b/Neopixel strip of any length on ONEWIRE
+
+        Args:
+            count (int): number of leds, the firmware supports up to 1000
+
+        Returns:
+            PixelStrip: the strip, also in PIXELS
+        """
+        print(f"Initialising {count} WS2812b leds on GP{self.ONEWIRE.id}")
+        self.PIXELS = PixelStrip(self.ONEWIRE, count, lock=self.LOCK)
+        return self.PIXELS
 
     def map_range(
         self, value: int, in_min: int, in_max: int, out_min: int, out_max: int
@@ -426,6 +1212,14 @@ class Xpander:
         return value * out_max // in_max
 
 
+def _colour_byte(value) -> int:
+    """A colour value saturated to a byte, 0 if it is not a number"""
+    try:
+        return min(max(int(value), 0), 255)
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
 # diagnostics test code
 if __name__ == "__main__":
 
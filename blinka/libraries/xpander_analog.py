@@ -0,0 +1,366 @@
+"""
+Calibration and streaming filters for the picoXpander analog channels
+"""
+
+from array import array
+
+
+class Calibration:
+    """Mapping of 16 bit analog values, linear, piecewise linear or a table\n
+    Linear and piecewise mappings are held as segments with precomputed
+    32 bit fixed point slopes and clamp to the end points, the linear
+    mapping gives the same results as map_range. Table mappings index a
+    table, usually of 65536 entries, with the top bits of the value.
+    apply() maps whole arrays through a 65536 entry lookup table built
+    on first use, by numpy indexing for numpy arrays.
+    """
+
+    def __init__(self, points=((0, 0), (65535, 65535)), table=None):
+        """
+        Args:
+            points (list): (in, out) pairs of the piecewise linear mapping
+            table (list): values to look up instead of the points
+        """
+        self.table = None
+        self.points = None
+        self._lut = None
+        self._np_lut = None
+        if table is not None:
+            self.table = [int(value) for value in table]
+            if not self.table:
+                raise ValueError("table is empty")
+            return
+        self.points = sorted((int(x), int(y)) for x, y in points)
+        if len(self.points) < 2:
+            raise ValueError("at least two points are needed")
+        self._xs = [x for x, _ in self.points]
+        self._segments = []
+        for (x0, y0), (x1, y1) in zip(self.points, self.points[1:]):
+            if x1 == x0:
+                raise ValueError("points must have different inputs")
+            # rounded up so whole results are not truncated to one less
+            self._segments.append((x0, y0, -((-(y1 - y0) << 32) // (x1 - x0))))
+
+    @classmethod
+    def linear(cls, in_min: int, in_max: int, out_min: int, out_max: int):
+        """The map_range(value, in_min, in_max, out_min, out_max) mapping"""
+        return cls(((in_min, out_min), (in_max, out_max)))
+
+    @classmethod
+    def piecewise(cls, points):
+        """A piecewise linear mapping through (in, out) points"""
+        return cls(points)
+
+    @classmethod
+    def from_table(cls, table):
+        """A table mapping, usually with 65536 entries"""
+        return cls(table=table)
+
+    @property
+    def kind(self) -> str:
+        if self.table is not None:
+            return "table"
+        return "linear" if len(self.points) == 2 else "piecewise"
+
+    def to_dict(self) -> dict:
+        """The mapping as a dict that can be saved as json"""
+        if self.table is not None:
+            return {"kind": "table", "table": self.table}
+        return {"kind": self.kind, "points": [list(point) for point in self.points]}
+
+    @classmethod
+    def from_dict(cls, saved: dict):
+        """The mapping from a dict made by to_dict()"""
+        if saved["kind"] == "table":
+            return cls(table=saved["table"])
+        return cls(saved["points"])
+
+    def map(self, value: int) -> int:
+        """Map one value
+
+        Args:
+            value (int): 0-65535
+
+        Returns:
+            int: the mapped value
+        """
+        if self.table is not None:
+            value = min(max(value, 0), 65535)
+            return self.table[value * len(self.table) >> 16]
+        xs = self._xs
+        if value <= xs[0]:
+            return self.points[0][1]
+        if value >= xs[-1]:
+            return self.points[-1][1]
+        # binary search for the segment, there is no bisect in Circuitpython
+        low, high = 0, len(xs) - 1
+        while high - low > 1:
+            middle = (low + high) // 2
+            if xs[middle] <= value:
+                low = middle
+            else:
+                high = middle
+        x0, y0, slope = self._segments[low]
+        return y0 + ((value - x0) * slope >> 32)
+
+    def lut(self):
+        """The 65536 entry lookup table of the mapping, built once
+
+        Returns:
+            array: the mapped value of every 16 bit input
+        """
+        if self._lut is None:
+            self._lut = array("l", map(self.map, range(65536)))
+        return self._lut
+
+    def apply(self, values):
+        """Map a whole array of values
+
+        Args:
+            values: array, list or numpy array of 0-65535 values, clamped to
+                that range like map()
+
+        Returns:
+            the mapped values, a numpy array for numpy input else an array
+        """
+        if hasattr(values, "__array_interface__"):
+            # pylint: disable=import-outside-toplevel
+            import numpy
+
+            if self._np_lut is None:
+                self._np_lut = numpy.array(self.lut(), dtype=numpy.int64)
+            # clipped before the cast, uint16 would wrap the out of range values
+            values = numpy.clip(numpy.asarray(values, dtype=numpy.int64), 0, 65535)
+            return self._np_lut[values]
+        try:
+            lut = self.lut()
+        except MemoryError:
+            # too big for a microcontroller, map each value instead
+            return array("l", map(self.map, values))
+        return array("l", (lut[min(max(value, 0), 65535)] for value in values))
+
+
+class Filter:
+    """Base of the streaming filters for analog samples\n
+    update() takes one sample, process() a block of them. value is the
+    latest output, None until there is one. Decimating filters only
+    produce an output every few samples, update() returns None between.
+    """
+
+    def __init__(self):
+        self.value = None
+
+    def update(self, sample):
+        """Filter one sample, must be implemented by the subclass"""
+        raise NotImplementedError
+
+    def process(self, samples) -> list:
+        """Filter a block of samples
+
+        Args:
+            samples: list, array or numpy array of samples
+
+        Returns:
+            list: the outputs, one per sample unless decimating
+        """
+        update = self.update
+        outputs = [update(sample) for sample in samples]
+        return [output for output in outputs if output is not None]
+
+    def reset(self):
+        """Forget the samples seen, must be implemented by the subclass"""
+        raise NotImplementedError
+
+
+class MovingAverage(Filter):
+    """Average of the last n samples, a ring buffer and a running sum"""
+
+    def __init__(self, n: int = 8):
+        """
+        Args:
+            n (int): samples averaged. default 8
+        """
+        super().__init__()
+        if n < 1:
+            raise ValueError("n must be 1 or more")
+        self.n = n
+        self.reset()
+
+    def reset(self):
+        self._ring = [0] * self.n
+        self._index = 0
+        self._count = 0
+        self._sum = 0
+        self.value = None
+
+    def update(self, sample):
+        self._sum += sample - self._ring[self._index]
+        self._ring[self._index] = sample
+        self._index = (self._index + 1) % self.n
+        if self._count < self.n:
+            self._count += 1
+        self.value = self._sum / self._count
+        return self.value
+
+
+class EMA(Filter):
+    """Exponential moving average, value += alpha * (sample - value)"""
+
+    def __init__(self, alpha: float = 0.1):
+        """
+        Args:
+            alpha (float): weight of a new sample, 0 to 1. default 0.1
+        """
+        super().__init__()
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be above 0 and at most 1")
+        self.alpha = alpha
+
+    def reset(self):
+        self.value = None
+
+    def update(self, sample):
+        if self.value is None:
+            self.value = float(sample)
+        else:
+            self.value += self.alpha * (sample - self.value)
+        return self.value
+
+
+class Median(Filter):
+    """Median of the last n samples, a ring buffer plus a sorted window\n
+    Unlike the other filters an update is not O(1), the old and new
+    samples are found by binary search, O(log n), and the list insert and
+    delete shift up to n entries, O(n). That is fastest for the short
+    windows a median is used for.
+    """
+
+    def __init__(self, n: int = 5):
+        """
+        Args:
+            n (int): samples in the window, odd is best. default 5
+        """
+        super().__init__()
+        if n < 1:
+            raise ValueError("n must be 1 or more")
+        self.n = n
+        self.reset()
+
+    def reset(self):
+        self._ring = []
+        self._index = 0
+        self._sorted = []
+        self.value = None
+
+    @staticmethod
+    def _find(window: list, sample) -> int:
+        """Position of a sample in the sorted window"""
+        # there is no bisect in Circuitpython
+        low, high = 0, len(window)
+        while low < high:
+            middle = (low + high) // 2
+            if window[middle] < sample:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def update(self, sample):
+        window = self._sorted
+        if len(self._ring) < self.n:
+            self._ring.append(sample)
+        else:
+            del window[self._find(window, self._ring[self._index])]
+            self._ring[self._index] = sample
+            self._index = (self._index + 1) % self.n
+        window.insert(self._find(window, sample), sample)
+        middle = len(window) // 2
+        if len(window) % 2:
+            self.value = window[middle]
+        else:
+            self.value = (window[middle - 1] + window[middle]) / 2
+        return self.value
+
+
+class CIC(Filter):
+    """Decimating cascaded integrator comb filter\n
+    order integrators run at the sample rate and order combs at the
+    output rate, one output every decimation samples, scaled back to the
+    input range. Integer samples are filtered with integer arithmetic.
+    """
+
+    def __init__(self, decimation: int = 8, order: int = 2):
+        """
+        Args:
+            decimation (int): samples per output. default 8
+            order (int): number of integrator and comb stages. default 2
+        """
+        super().__init__()
+        if decimation < 1 or order < 1:
+            raise ValueError("decimation and order must be 1 or more")
+        self.decimation = decimation
+        self.order = order
+        self.gain = decimation**order
+        self.reset()
+
+    def reset(self):
+        self._integrators = [0] * self.order
+        self._combs = [0] * self.order
+        self._phase = 0
+        self.value = None
+
+    def update(self, sample):
+        integrators = self._integrators
+        for stage in range(self.order):
+            sample = integrators[stage] = integrators[stage] + sample
+        self._phase += 1
+        if self._phase < self.decimation:
+            return None
+        self._phase = 0
+        combs = self._combs
+        for stage in range(self.order):
+            sample, combs[stage] = sample - combs[stage], sample
+        self.value = sample / self.gain
+        return self.value
+
+
+class FIR(Filter):
+    """Finite impulse response filter with optional decimation\n
+    The samples are kept in a ring buffer of the length of the taps and
+    the sum of products is only worked out for the samples that produce
+    an output.
+    """
+
+    def __init__(self, taps, decimation: int = 1):
+        """
+        Args:
+            taps (list): filter coefficients, E.g. [0.25, 0.5, 0.25]
+            decimation (int): samples per output. default 1
+        """
+        super().__init__()
+        if not taps or decimation < 1:
+            raise ValueError("taps can't be empty and decimation must be 1 or more")
+        # reversed so the oldest sample meets the last tap
+        self.taps = list(taps)[::-1]
+        self.decimation = decimation
+        self.reset()
+
+    def reset(self):
+        self._ring = [0] * len(self.taps)
+        self._index = 0
+        self._phase = 0
+        self.value = None
+
+    def update(self, sample):
+        ring = self._ring
+        ring[self._index] = sample
+        self._index = (self._index + 1) % len(ring)
+        self._phase += 1
+        if self._phase < self.decimation:
+            return None
+        self._phase = 0
+        # the ring from the oldest sample, lined up with the reversed taps
+        index = self._index
+        window = ring[index:] + ring[:index]
+        self.value = sum(tap * value for tap, value in zip(self.taps, window))
+        return self.value
@@ -0,0 +1,14 @@
+"""
+Lock stand in for the picoXpander libraries
+Used where a lock is optional and under Circuitpython, which has no threads
+"""
+
+
+class NoLock:
+    """Stand in for the lock when none is given"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
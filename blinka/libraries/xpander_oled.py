@@ -0,0 +1,174 @@
+"""
+Several OLEDs sharing the picoXpander I2C bus
+The OLEDs use the sh1106v3 or adafruit_ssd1306 drivers set up by Xpander
+"""
+
+import time
+
+try:
+    from threading import RLock
+except ImportError:
+    # no threads under Circuitpython/Micropython
+    RLock = None
+
+from xpander_lock import NoLock
+
+
+def oled_memory(oled):
+    """The framebuffer memory of an OLED driver, 8 pixel pages of width bytes"""
+    # the SH1106 driver wraps its framebuffer, the SSD1306 driver is one
+    return getattr(oled, "framebuf", oled).buf
+
+
+def show_oled_pages(oled, pages: list):
+    """Send the given OLED pages, grouping neighbouring pages into one write
+
+    Args:
+        oled: the OLED driver
+        pages (list): page numbers to send
+    """
+    if not pages:
+        return
+    if not hasattr(oled, "show_pages"):
+        oled.show()
+        return
+    pages.sort()
+    first = last = pages[0]
+    for page in pages[1:]:
+        if page != last + 1:
+            oled.show_pages(first, last)
+            first = page
+        last = page
+    oled.show_pages(first, last)
+
+
+class OLEDManager:
+    """Registry of several OLEDs sharing the Xpander I2C bus\n
+    Draw into the OLEDs as normal but call flush() instead of show().
+    Each flush() is one scheduling pass that takes the bus lock once and
+    sends only the changed pages of the OLEDs that are due, starting with
+    a different OLED each pass and capped at a frame rate per OLED.
+    A page budget per pass keeps a full redraw from starving the other
+    OLEDs or the I/O scan, the remaining pages go out on the next passes.
+    """
+
+    def __init__(self, lock=None):
+        # the bus lock can be shared with threads polling the I/O
+        self.lock = lock if lock else (RLock() if RLock else NoLock())
+        self._panels = {}
+        self._order = []
+        self._next = 0  # the OLED to start the next pass with
+
+    def add(self, name: str, oled, fps=10):
+        """Register an OLED driver
+
+        Args:
+            name (str): name to look the OLED up with
+            oled: SH1106_I2C or SSD1306_I2C driver
+            fps (int): maximum refresh rate of this OLED. default 10
+        """
+        if name in self._panels:
+            self.remove(name)
+        memory = oled_memory(oled)
+        panel = {
+            "oled": oled,
+            "period": 1.0 / fps if fps and fps > 0 else 0.0,
+            "due": 0.0,
+            # what the OLED currently shows, forces a full first refresh
+            "shadow": bytearray(len(memory)),
+            "pending": list(range(oled.height // 8)),
+        }
+        with self.lock:
+            self._panels[name] = panel
+            self._order.append(name)
+
+    def remove(self, name: str):
+        """Remove an OLED from the registry"""
+        with self.lock:
+            if name in self._panels:
+                del self._panels[name]
+                self._order.remove(name)
+                self._next = 0
+
+    def __getitem__(self, name: str):
+        return self._panels[name]["oled"]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._panels
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def names(self) -> list:
+        """Names of the registered OLEDs"""
+        return list(self._order)
+
+    def invalidate(self, name: str = None):
+        """Resend every page on the next flush, E.g. after the OLED was reset
+
+        Args:
+            name (str): OLED to resend, None for all of them
+        """
+        with self.lock:
+            for key in self._order if name is None else [name]:
+                panel = self._panels[key]
+                panel["pending"] = list(range(panel["oled"].height // 8))
+
+    def flush(self, max_pages: int = 8) -> int:
+        """Send the changed pages of the OLEDs that are due for a refresh
+
+        Args:
+            max_pages (int): most pages sent in this pass, None for no limit
+
+        Returns:
+            int: number of pages sent
+        """
+        sent = 0
+        now = time.monotonic()
+        with self.lock:
+            count = len(self._order)
+            for i in range(count):
+                panel = self._panels[self._order[(self._next + i) % count]]
+                if now < panel["due"]:
+                    continue
+                pages = self._changed_pages(panel)
+                if not pages:
+                    continue
+                if max_pages is not None and sent + len(pages) > max_pages:
+                    pages = pages[: max_pages - sent]
+                if not pages:
+                    break
+                self._send(panel, pages)
+                sent += len(pages)
+                panel["due"] = now + panel["period"]
+            if count:
+                self._next = (self._next + 1) % count
+        return sent
+
+    def _changed_pages(self, panel) -> list:
+        """Pages that differ from what the OLED shows, including any left over"""
+        oled = panel["oled"]
+        memory = oled_memory(oled)
+        shadow = panel["shadow"]
+        pending = panel["pending"]
+        width = oled.width
+        for page in range(oled.height // 8):
+            if page in pending:
+                continue
+            start = page * width
+            if memory[start : start + width] != shadow[start : start + width]:
+                pending.append(page)
+        pending.sort()
+        return pending
+
+    def _send(self, panel, pages: list):
+        """Send the pages and record them as shown"""
+        oled = panel["oled"]
+        memory = oled_memory(oled)
+        shadow = panel["shadow"]
+        width = oled.width
+        for page in pages:
+            start = page * width
+            shadow[start : start + width] = memory[start : start + width]
+        show_oled_pages(oled, list(pages))
+        panel["pending"] = [page for page in panel["pending"] if not page in pages]
@@ -0,0 +1,455 @@
+"""
+WS2812b/Neopixel strips, colour correction and animations for the picoXpander
+The strip is on the one wire pin, Xpander.ONEWIRE
+"""
+
+import math
+import time
+
+from xpander_lock import NoLock
+
+
+class PixelPipeline:
+    """Colour correction of WS2812b/Neopixel frames with lookup tables\n
+    Brightness and gamma are folded into one 256 entry table that is
+    applied to the whole frame with bytes.translate, the channels are
+    then reordered into the colour order of the leds with a slice copy
+    per channel. numpy uint8 arrays are looked up and reordered by numpy.
+    Calling the pipeline returns the corrected frame in a buffer that is
+    reused while the number of leds stays the same.
+    """
+
+    def __init__(
+        self,
+        order: str = "GRB",
+        source: str = "RGB",
+        brightness: float = 1.0,
+        gamma: float = 2.6,
+    ):
+        """
+        Args:
+            order (str): colour order of the leds, E.g. "GRB" or "GRBW". default "GRB"
+            source (str): colour order of the frames passed in, "RGB" or "RGBW"
+            brightness (float): 0.0 to 1.0. default 1.0
+            gamma (float): gamma correction, 1.0 for none. default 2.6
+        """
+        self.order = order
+        self.source = source
+        # (output channel, input channel), channels missing in source stay 0
+        self._channels = [
+            (i, source.index(colour))
+            for i, colour in enumerate(order)
+            if colour in source
+        ]
+        self._brightness = brightness
+        self._gamma = gamma
+        self._table = None
+        self._out = bytearray()
+        self._np_table = None
+        self._build()
+
+    def _build(self):
+        """Fold the brightness and gamma into the lookup table"""
+        brightness = min(max(self._brightness, 0.0), 1.0)
+        self._table = bytes(
+            round(((i / 255) ** self._gamma) * brightness * 255) for i in range(256)
+        )
+        self._np_table = None
+
+    @property
+    def brightness(self) -> float:
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, value: float):
+        self._brightness = value
+        self._build()
+
+    @property
+    def gamma(self) -> float:
+        return self._gamma
+
+    @gamma.setter
+    def gamma(self, value: float):
+        self._gamma = value
+        self._build()
+
+    def __call__(self, frame):
+        """Correct and reorder a frame
+
+        Args:
+            frame: RGB(W) byte values, bytes, bytearray, memoryview, list,
+                array('B') or a numpy uint8 array
+
+        Returns:
+            bytearray: the frame in the colour order of the leds
+        """
+        size_in = len(self.source)
+        size_out = len(self.order)
+        if hasattr(frame, "__array_interface__"):
+            return self._numpy(frame, size_in, size_out)
+        if not isinstance(frame, (bytes, bytearray)):
+            frame = bytes(frame)
+        count = len(frame) // size_in
+        frame = frame[: count * size_in]
+        if hasattr(frame, "translate"):
+            frame = frame.translate(self._table)
+        else:
+            # no bytes.translate under Circuitpython
+            frame = bytes(self._table[value] for value in frame)
+        out = self._out
+        if len(out) != count * size_out:
+            out = self._out = bytearray(count * size_out)
+        for dst, src in self._channels:
+            out[dst::size_out] = frame[src::size_in]
+        return out
+
+    def _numpy(self, frame, size_in: int, size_out: int):
+        """The numpy version of the pipeline"""
+        # pylint: disable=import-outside-toplevel
+        import numpy
+
+        if self._np_table is None:
+            self._np_table = numpy.frombuffer(self._table, dtype=numpy.uint8)
+        pixels = numpy.asarray(frame, dtype=numpy.uint8).reshape(-1)
+        count = len(pixels) // size_in
+        pixels = pixels[: count * size_in].reshape(count, size_in)
+        if len(self._out) != count * size_out:
+            self._out = bytearray(count * size_out)
+        out = numpy.frombuffer(self._out, dtype=numpy.uint8).reshape(count, size_out)
+        for dst, src in self._channels:
+            numpy.take(self._np_table, pixels[:, src], out=out[:, dst])
+        return self._out
+
+
+class PixelStrip:
+    """WS2812b/Neopixel strip of any length on the one wire pin\n
+    buf holds the GRB bytes of the strip, fill it and call show().
+    Under Blinka the frame is streamed to the u2if firmware over the
+    serial port and show() waits for the firmware's completion report
+    instead of sleeping, so frames go out at the rate the strip allows.
+    The lock is held from the write to the completion report so no other
+    HID transfer can pick up the report.
+    Under Circuitpython the native neopixel_write is used.
+    """
+
+    def __init__(self, pin, count: int, timeout: float = 1.0, lock=None):
+        """
+        Args:
+            pin: the data pin, E.g. Xpander.ONEWIRE
+            count (int): number of leds, the firmware supports up to 1000
+            timeout (float): seconds to wait for the completion report. default 1
+            lock: shared with the other users of the interface, E.g. Xpander.LOCK
+        """
+        self.pin = pin
+        self.count = count
+        self.timeout = timeout
+        self.lock = lock if lock else NoLock()
+        self.buf = bytearray(3 * count)
+        self._frame = None  # a frame of another length fitted to the strip
+        self._u2if = None
+        try:
+            # pylint: disable=import-outside-toplevel
+            from adafruit_blinka.microcontroller.rp2040_u2if.rp2040_u2if import (
+                rp2040_u2if,
+            )
+
+            self._u2if = rp2040_u2if
+        except ImportError:
+            # Circuitpython, the native neopixel_write is used
+            import neopixel_write  # pylint: disable=import-outside-toplevel
+
+            self._neopixel_write = neopixel_write.neopixel_write
+            return
+        # the firmware takes a 32 bit word per led, 0 B R G for G R B
+        self._wire = bytearray(4 * count)
+        self._write = bytes([rp2040_u2if.WS2812B_WRITE]) + len(self._wire).to_bytes(
+            4, "little"
+        )
+        self._started = False
+
+    def __len__(self) -> int:
+        return self.count
+
+    def fill(self, color):
+        """Set every led to the same GRB colour
+
+        Args:
+            color: 3 GRB byte values
+        """
+        self.buf[:] = bytes(color) * self.count
+
+    def show(self, buffer=None):
+        """Send a frame to the strip and wait for it to be written
+
+        Args:
+            buffer: GRB bytes to send instead of buf, a shorter frame leaves
+                the remaining leds off and a longer one is cut to the strip
+        """
+        if buffer is None:
+            buffer = self.buf
+        elif len(buffer) != 3 * self.count:
+            buffer = self._fit(buffer)
+        if self._u2if is None:
+            self._neopixel_write(self.pin, buffer)
+            return
+        wire = self._wire
+        wire[1::4] = buffer[2::3]
+        wire[2::4] = buffer[1::3]
+        wire[3::4] = buffer[0::3]
+        with self.lock:
+            if not self._started:
+                # the stock write opens the serial port and sets up the pin
+                self._u2if.neopixel_write(self.pin, wire)
+                self._started = True
+                return
+            self._stream(wire)
+            self._wait()
+
+    def _fit(self, buffer) -> bytearray:
+        """Copy a frame of another length into one the length of the strip"""
+        if self._frame is None:
+            self._frame = bytearray(3 * self.count)
+        frame = self._frame
+        size = min(len(buffer), len(frame))
+        frame[:size] = bytes(buffer[:size])
+        frame[size:] = bytes(len(frame) - size)
+        return frame
+
+    def _stream(self, wire):
+        """Announce the frame over HID then stream it over the serial port"""
+        # pylint: disable=protected-access
+        u2if = self._u2if
+        u2if._serial.reset_output_buffer()
+        resp = u2if._hid_xfer(self._write, True)
+        if resp[1] != u2if.RESP_OK:
+            if resp[2] == 0x01:
+                raise RuntimeError(
+                    "Neopixel write error : too many pixel for the firmware."
+                )
+            if resp[2] == 0x02:
+                raise RuntimeError(
+                    "Neopixel write error : transfer already in progress."
+                )
+            raise RuntimeError("Neopixel write error.")
+        u2if._serial.write(wire)
+        # the firmware needs a short last packet, as in the u2if driver
+        if len(wire) % 64 == 0:
+            u2if._serial.write(b"\0")
+        u2if._serial.flush()
+
+    def _wait(self):
+        """Wait for the completion report of the frame just sent"""
+        # pylint: disable=protected-access
+        u2if = self._u2if
+        deadline = time.monotonic() + self.timeout
+        while True:
+            resp = u2if._hid.read(64, 50)
+            if resp and resp[0] == u2if.WS2812B_WRITE:
+                break
+            if time.monotonic() > deadline:
+                raise RuntimeError("Neopixel write (flush) timed out.")
+        if resp[1] != u2if.RESP_OK:
+            raise RuntimeError("Neopixel write (flush) error.")
+
+
+def _hue_rgb(hue: int) -> bytes:
+    """Full saturation and value RGB of a 0-255 hue"""
+    sector, offset = divmod(hue * 6, 256)
+    rise = offset
+    fall = 255 - offset
+    return bytes(
+        (
+            (255, rise, 0),
+            (fall, 255, 0),
+            (0, 255, rise),
+            (0, fall, 255),
+            (rise, 0, 255),
+            (255, 0, fall),
+        )[sector]
+    )
+
+
+# HSV to RGB at full saturation and value, one RGB triplet per 0-255 hue
+HUES = [_hue_rgb(hue) for hue in range(256)]
+# a raised cosine ramp from 0 to 255, for breathing
+_BREATHE = bytes(round(255 * (1 - math.cos(math.pi * i / 255)) / 2) for i in range(256))
+# saturating add of two bytes
+_SATURATE = bytes(min(i, 255) for i in range(511))
+
+
+def rainbow(count: int, cycle: float = 5.0):
+    """Rainbow effect, the whole hue circle spread over the strip
+
+    Args:
+        count (int): number of leds
+        cycle (float): seconds for one turn of the hue circle. default 5
+    """
+    strip = b"".join(HUES[i * 256 // count] for i in range(count))
+    t = yield
+    while True:
+        shift = 3 * (int(t * count / cycle) % count)
+        t = yield strip[shift:] + strip[:shift]
+
+
+def chase(count: int, color, width: int = 3, speed: float = 10):
+    """Chase effect, a block of leds running along the strip
+
+    Args:
+        count (int): number of leds
+        color: RGB byte values of the block
+        width (int): leds in the block. default 3
+        speed (float): leds per second. default 10
+    """
+    width = min(width, count)
+    strip = bytes(color) * width + bytes(3 * (count - width))
+    t = yield
+    while True:
+        shift = 3 * (int(t * speed) % count)
+        t = yield strip[-shift:] + strip[:-shift] if shift else strip
+
+
+def breathe(count: int, color, period: float = 2.0):
+    """Breathe effect, every led fading in and out together
+
+    Args:
+        count (int): number of leds
+        color: RGB byte values at full brightness
+        period (float): seconds per breath. default 2
+    """
+    color = bytes(color)
+    t = yield
+    while True:
+        phase = int(t * 512 / period) % 512
+        level = _BREATHE[phase if phase < 256 else 511 - phase]
+        t = yield bytes(value * level // 255 for value in color) * count
+
+
+class Animator:
+    """Frame paced WS2812b/Neopixel animations\n
+    Effects are generators that receive the animation time in seconds
+    with send() and yield a frame of RGB bytes, see rainbow(), chase()
+    and breathe(). Several effects are composited into one frame, either
+    by the brightest value ("max") or a saturating sum ("add").
+    run() produces the frames at a fixed rate against the monotonic
+    clock, so late frames don't make the animation drift, and a frame
+    that is the same as the last one sent is not sent again.
+
+    E.g. Animator(PLC.RGBshow, 16).add(rainbow(16)).run(10)
+    """
+
+    def __init__(self, show, count: int, fps: float = 30):
+        """
+        Args:
+            show: called with each changed frame, E.g. Xpander.RGBshow
+            count (int): number of leds, up to the length of the strip
+            fps (float): frames per second. default 30
+        """
+        # E.g. Xpander.RGBshow sends to PIXELS, PixelStrip.show to the strip
+        owner = getattr(show, "__self__", None)
+        leds = getattr(getattr(owner, "PIXELS", owner), "count", None)
+        if isinstance(leds, int) and count > leds:
+            raise ValueError(f"{count} leds do not fit on the {leds} led strip")
+        self.show = show
+        self.count = count
+        self.fps = fps
+        self._layers = []
+        self._last = None
+        self._start = None
+        self.reset_stats()
+
+    def add(self, effect, mode: str = "max"):
+        """Add an effect on top of the others
+
+        Args:
+            effect: the effect generator, E.g. rainbow(16)
+            mode (str): "max" or "add" to composite it. default "max"
+
+        Returns:
+            Animator: itself, so calls can be chained
+        """
+        if mode not in ("max", "add"):
+            raise ValueError("mode must be max or add")
+        next(effect)
+        self._layers.append((effect, mode))
+        return self
+
+    def clear(self):
+        """Remove all the effects"""
+        self._layers = []
+        self._last = None
+
+    def reset_stats(self):
+        """Restart the timing statistics"""
+        self.frames = 0  # frames produced
+        self.sent = 0  # frames sent to the leds
+        self.late = 0  # frames produced after their due time
+        self.max_late = 0.0  # seconds, the worst lateness
+        self._stats_start = time.monotonic()
+
+    def stats(self) -> dict:
+        """The timing statistics since reset_stats()
+
+        Returns:
+            dict: frames, sent, unchanged, late, max_late_ms and fps achieved
+        """
+        elapsed = time.monotonic() - self._stats_start
+        return {
+            "frames": self.frames,
+            "sent": self.sent,
+            "unchanged": self.frames - self.sent,
+            "late": self.late,
+            "max_late_ms": self.max_late * 1000,
+            "fps": self.frames / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def step(self, t: float) -> bool:
+        """Produce the frame for an animation time and send it if it changed
+
+        Args:
+            t (float): animation time in seconds
+
+        Returns:
+            bool: True when the frame was sent
+        """
+        frame = None
+        for effect, mode in self._layers:
+            layer = effect.send(t)
+            if frame is None:
+                frame = bytes(layer)
+            elif mode == "max":
+                frame = bytes(map(max, frame, layer))
+            else:
+                frame = bytes(_SATURATE[a + b] for a, b in zip(frame, layer))
+        self.frames += 1
+        if frame is None or frame == self._last:
+            return False
+        self._last = frame
+        self.show(frame)
+        self.sent += 1
+        return True
+
+    def run(self, duration: float = None):
+        """Run the animation at the frame rate
+
+        Args:
+            duration (float): seconds to run for, None to run forever
+        """
+        period = 1 / self.fps
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+        start = next_frame = now
+        while duration is None or now - start < duration:
+            self.step(next_frame - self._start)
+            next_frame += period
+            now = time.monotonic()
+            if next_frame > now:
+                time.sleep(next_frame - now)
+                now = next_frame
+            else:
+                late = now - next_frame
+                self.late += 1
+                self.max_late = max(self.max_late, late)
+                # skip the frames that were missed instead of catching up
+                next_frame += (late // period) * period
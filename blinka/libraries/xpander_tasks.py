@@ -0,0 +1,603 @@
+"""
+Fixed rate function blocks driving the picoXpander PWM outputs
+They run in background threads under Blinka, under Circuitpython call
+their tick() or update() from the main loop instead
+"""
+
+import math
+import time
+
+try:
+    from threading import Event, Thread
+except ImportError:
+    # no threads under Circuitpython/Micropython
+    Event = Thread = None
+
+from xpander_lock import NoLock
+
+
+class PWMPlayer:
+    """Steps a PWM output through a table of duty cycles at a fixed rate\n
+    The step is worked out from the time since the start, so a late step
+    catches up instead of stretching the waveform, and the duty cycle is
+    only written when it changes.
+    """
+
+    def __init__(self, pwm, table, rate_hz: float, loop: bool = True, lock=None):
+        """
+        Args:
+            pwm: the PWMOut to drive
+            table (list): duty cycles 0-65535
+            rate_hz (float): steps per second
+            loop (bool): repeat the table. default True
+            lock: held around each duty cycle write, E.g. Xpander.LOCK
+        """
+        self.pwm = pwm
+        self.lock = lock if lock else NoLock()
+        self._thread = None
+        self._stop = None
+        self._duty = None
+        self.swap(table, rate_hz, loop)
+
+    def swap(self, table, rate_hz: float = None, loop: bool = None):
+        """Start playing another table
+
+        Args:
+            table (list): duty cycles 0-65535
+            rate_hz (float): steps per second, None to keep the current rate
+            loop (bool): repeat the table, None to keep the current setting
+        """
+        table = tuple(min(max(int(duty), 0), 65535) for duty in table)
+        if not table:
+            raise ValueError("table is empty")
+        if rate_hz is not None:
+            if rate_hz <= 0:
+                raise ValueError("rate_hz must be above 0")
+            self.rate = rate_hz
+        if loop is not None:
+            self.loop = loop
+        # one assignment, so the thread never sees half a swap
+        self._play = (table, time.monotonic())
+
+    @property
+    def playing(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def update(self) -> bool:
+        """Write the duty cycle due now
+
+        Returns:
+            bool: False once a table that does not loop has finished
+        """
+        table, start = self._play
+        step = int((time.monotonic() - start) * self.rate)
+        finished = False
+        if self.loop:
+            step %= len(table)
+        elif step >= len(table):
+            step = len(table) - 1
+            finished = True
+        duty = table[step]
+        if duty != self._duty:
+            with self.lock:
+                self.pwm.duty_cycle = duty
+            self._duty = duty
+        return not finished
+
+    def start(self):
+        """Play the table from a background thread"""
+        if self.playing:
+            return
+        self._stop = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop playing, the output keeps its last duty cycle"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        next_step = time.monotonic()
+        while not self._stop.is_set() and self.update():
+            period = 1 / self.rate
+            next_step += period
+            now = time.monotonic()
+            if next_step > now:
+                self._stop.wait(next_step - now)
+            else:
+                # running late, restart the pacing from now
+                next_step = now
+
+
+class FixedRateTask:
+    """Base of the function blocks run at a fixed rate\n
+    Subclasses implement tick(). run() calls it at rate_hz against the
+    monotonic clock, in the calling thread or from a background thread
+    with start(). The lateness of every tick against its schedule is
+    kept as the jitter statistics, ticks that are missed are skipped.
+    """
+
+    def __init__(self, rate_hz: float, lock=None):
+        """
+        Args:
+            rate_hz (float): ticks per second
+            lock: held around each tick, E.g. Xpander.LOCK
+        """
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be above 0")
+        self.rate = rate_hz
+        self.lock = lock if lock else NoLock()
+        self._thread = None
+        self._stop = None
+        self.reset_stats()
+
+    def tick(self):
+        """One update of the block, must be implemented by the subclass"""
+        raise NotImplementedError
+
+    def reset_stats(self):
+        """Restart the timing statistics"""
+        self.ticks = 0
+        self.late = 0  # ticks started a whole period or more late
+        self.max_jitter = 0.0  # seconds
+        self._jitter_sum = 0.0
+        self._stats_start = time.monotonic()
+
+    def stats(self) -> dict:
+        """The timing statistics since reset_stats()
+
+        Returns:
+            dict: ticks, late, max_jitter_ms, mean_jitter_ms and rate achieved
+        """
+        elapsed = time.monotonic() - self._stats_start
+        return {
+            "ticks": self.ticks,
+            "late": self.late,
+            "max_jitter_ms": self.max_jitter * 1000,
+            "mean_jitter_ms": (
+                self._jitter_sum * 1000 / self.ticks if self.ticks else 0.0
+            ),
+            "rate": self.ticks / elapsed if elapsed > 0 else 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def run(self, duration: float = None):
+        """Tick at the fixed rate in the calling thread
+
+        Args:
+            duration (float): seconds to run for, None until stop()
+        """
+        period = 1 / self.rate
+        start = next_tick = time.monotonic()
+        while not (self._stop and self._stop.is_set()):
+            now = time.monotonic()
+            if duration is not None and now - start >= duration:
+                break
+            if next_tick > now:
+                if self._stop:
+                    self._stop.wait(next_tick - now)
+                else:
+                    time.sleep(next_tick - now)
+                continue
+            jitter = now - next_tick
+            self.max_jitter = max(self.max_jitter, jitter)
+            self._jitter_sum += jitter
+            with self.lock:
+                self.tick()
+            self.ticks += 1
+            next_tick += period
+            if jitter >= period:
+                # skip the ticks that were missed instead of catching up
+                self.late += 1
+                next_tick += (jitter // period) * period
+
+    def start(self):
+        """Tick from a background thread"""
+        if self.running:
+            return
+        self._stop = Event()
+        self._thread = Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._stop = None
+
+
+class ADCtoPWM(FixedRateTask):
+    """Maps an ADC channel onto PWM outputs at a fixed rate\n
+    The linear mapping uses a precomputed 32 bit fixed point coefficient,
+    the table mapping indexes the table with the top bits of the ADC
+    value. A duty cycle is only written when it changes.
+    """
+
+    def __init__(self, adc, pwms: list, rate_hz: float = 100, lock=None):
+        """
+        Args:
+            adc: the AnalogIn to read
+            pwms (list): the PWMOuts to drive
+            rate_hz (float): updates per second. default 100
+            lock: held around each update, E.g. Xpander.LOCK
+        """
+        super().__init__(rate_hz, lock)
+        self.adc = adc
+        self.pwms = list(pwms)
+        self.value = None  # last ADC value read
+        self.duty = None  # last duty cycle written
+        self.writes = 0
+        self._table = None
+        self.set_linear(0, 65535, 0, 65535)
+
+    def set_linear(
+        self, in_min: int, in_max: int, out_min: int, out_max: int, clamp: bool = True
+    ):
+        """Map the ADC value as map_range(value, in_min, in_max, out_min, out_max)
+
+        Args:
+            in_min (int): low end of the ADC range
+            in_max (int): upper end of the ADC range
+            out_min (int): duty cycle at in_min
+            out_max (int): duty cycle at in_max
+            clamp (bool): keep the duty cycle within out_min and out_max
+        """
+        if in_max == in_min:
+            raise ValueError("in_min and in_max must differ")
+        low, high = (out_min, out_max) if clamp else (0, 65535)
+        scale = (out_max - out_min) << 32
+        # one tuple assignment, so a running tick never mixes two mappings
+        self._linear = (
+            in_min,
+            out_min,
+            # rounded up for inputs above in_min and down for inputs below
+            # it, so the shift floors exactly as map_range's // does
+            -(-scale // (in_max - in_min)),
+            scale // (in_max - in_min),
+            max(min(low, high), 0),
+            min(max(low, high), 65535),
+        )
+        self._table = None
+
+    def set_table(self, table):
+        """Map the ADC value through a table of duty cycles
+
+        Args:
+            table (list): duty cycles spread evenly over the ADC range
+        """
+        table = tuple(min(max(int(duty), 0), 65535) for duty in table)
+        if not table:
+            raise ValueError("table is empty")
+        self._table = table
+
+    def map(self, value: int) -> int:
+        """The duty cycle for an ADC value
+
+        Args:
+            value (int): ADC value 0-65535
+
+        Returns:
+            int: duty cycle 0-65535
+        """
+        table = self._table
+        if table is not None:
+            return table[value * len(table) >> 16]
+        in_min, out_min, scale_up, scale_down, low, high = self._linear
+        offset = value - in_min
+        duty = out_min + (offset * (scale_up if offset >= 0 else scale_down) >> 32)
+        return low if duty < low else high if duty > high else duty
+
+    def tick(self):
+        """Read the ADC and write the mapped duty cycle when it changed"""
+        self.value = self.adc.value
+        duty = self.map(self.value)
+        if duty != self.duty:
+            for pwm in self.pwms:
+                pwm.duty_cycle = duty
+            self.duty = duty
+            self.writes += 1
+
+    def telemetry(self) -> dict:
+        """The last values and the timing statistics
+
+        Returns:
+            dict: value, duty, writes and the stats()
+        """
+        telemetry = self.stats()
+        telemetry.update(value=self.value, duty=self.duty, writes=self.writes)
+        return telemetry
+
+
+class PID(FixedRateTask):
+    """PID controller function block\n
+    The output is clamped to out_min-out_max, 0-65535 for a duty cycle.
+    The integral stops growing while the output is saturated in the
+    direction of the error, so it does not wind up. The derivative acts
+    on the measurement, not the error, so setpoint changes don't kick the
+    output, and is low pass filtered.
+    tick() reads the ADC and writes the PWM, compute() is the controller
+    on its own for other inputs and outputs.
+    """
+
+    def __init__(
+        self,
+        kp: float,
+        ki: float = 0.0,
+        kd: float = 0.0,
+        setpoint: float = 0,
+        *,
+        rate_hz: float = 100,
+        adc=None,
+        pwm=None,
+        out_min: int = 0,
+        out_max: int = 65535,
+        d_filter: float = 0.01,
+        lock=None,
+    ):
+        """
+        Args:
+            kp (float): proportional gain
+            ki (float): integral gain, per second. default 0
+            kd (float): derivative gain, in seconds. default 0
+            setpoint (float): the value to hold. default 0
+            rate_hz (float): ticks per second, the controller's time step
+            adc: the AnalogIn to measure with in tick()
+            pwm: the PWMOut to drive in tick()
+            out_min (int): lowest output. default 0
+            out_max (int): highest output. default 65535
+            d_filter (float): time constant of the derivative filter in
+                seconds, 0 for none. default 0.01
+            lock: held around each tick, E.g. Xpander.LOCK
+        """
+        # pylint: disable=too-many-arguments
+        super().__init__(rate_hz, lock)
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.setpoint = setpoint
+        self.adc = adc
+        self.pwm = pwm
+        self.out_min = out_min
+        self.out_max = out_max
+        self.d_filter = d_filter
+        self.measurement = None  # last measurement
+        self.output = None  # last output
+        self.reset()
+
+    def reset(self):
+        """Clear the integral and derivative, E.g. before re-enabling the loop"""
+        self._integral = 0.0
+        self._derivative = 0.0
+        self._last = None
+
+    def compute(self, measurement: float) -> int:
+        """One step of the controller
+
+        Args:
+            measurement (float): the process value
+
+        Returns:
+            int: the output, clamped to out_min-out_max
+        """
+        dt = 1 / self.rate
+        error = self.setpoint - measurement
+        proportional = self.kp * error
+        if self._last is not None:
+            raw = -(measurement - self._last) / dt
+            alpha = dt / (self.d_filter + dt)
+            self._derivative += alpha * (raw - self._derivative)
+        self._last = measurement
+        derivative = self.kd * self._derivative
+        integral = self._integral + self.ki * error * dt
+        output = proportional + integral + derivative
+        # anti-windup, stop integrating into a saturated output, by the sign
+        # of the integral's drive so a negative ki is handled too
+        drive = self.ki * error
+        if (output > self.out_max and drive > 0) or (
+            output < self.out_min and drive < 0
+        ):
+            integral = self._integral
+        self._integral = max(min(integral, self.out_max), self.out_min)
+        output = proportional + self._integral + derivative
+        output = int(max(min(output, self.out_max), self.out_min))
+        self.measurement = measurement
+        self.output = output
+        return output
+
+    def tick(self):
+        """Read the ADC, compute and write the output when it changed"""
+        last = self.output
+        output = self.compute(self.adc.value)
+        if output != last:
+            self.pwm.duty_cycle = output
+
+
+class Servo(FixedRateTask):
+    """Hobby servo on a 50Hz PWM output\n
+    Setting angle or pulse_width moves the servo straight away. move_to()
+    plans a trapezoidal profile, limited by speed and acceleration, or an
+    S-curve profile with a smooth acceleration as well. Each tick writes
+    the duty cycle of the position due at that time, only when it changed.
+    The background thread idles once a move is done, move_to() starts it
+    again.
+    """
+
+    frequency = 50  # Hz
+
+    def __init__(
+        self,
+        pwm,
+        *,
+        min_pulse: int = 500,
+        max_pulse: int = 2500,
+        actuation_range: float = 180,
+        rate_hz: float = 100,
+        lock=None,
+    ):
+        """
+        Args:
+            pwm: the PWMOut, at 50Hz
+            min_pulse (int): pulse width at 0 degrees in us. default 500
+            max_pulse (int): pulse width at actuation_range in us. default 2500
+            actuation_range (float): degrees of travel. default 180
+            rate_hz (float): profile steps per second. default 100
+            lock: held around each duty cycle write, E.g. Xpander.LOCK
+        """
+        super().__init__(rate_hz, lock)
+        self.pwm = pwm
+        self.min_pulse = min_pulse
+        self.max_pulse = max_pulse
+        self.actuation_range = actuation_range
+        self._duty = None
+        self._pulse = None
+        self._plan = None
+
+    @property
+    def pulse_width(self) -> float:
+        """The pulse width in us, None until set"""
+        return self._pulse
+
+    @pulse_width.setter
+    def pulse_width(self, value: float):
+        self._plan = None
+        with self.lock:
+            self._write(value)
+
+    @property
+    def angle(self) -> float:
+        """The angle in degrees, None until set"""
+        if self._pulse is None:
+            return None
+        span = self.max_pulse - self.min_pulse
+        return (self._pulse - self.min_pulse) * self.actuation_range / span
+
+    @angle.setter
+    def angle(self, value: float):
+        self.pulse_width = self._angle_to_pulse(value)
+
+    @property
+    def moving(self) -> bool:
+        return self._plan is not None
+
+    def _angle_to_pulse(self, angle: float) -> float:
+        angle = min(max(angle, 0), self.actuation_range)
+        span = self.max_pulse - self.min_pulse
+        return self.min_pulse + angle * span / self.actuation_range
+
+    def _write(self, pulse: float):
+        """Output a pulse width, clamped to the servo's range"""
+        low, high = sorted((self.min_pulse, self.max_pulse))
+        pulse = min(max(pulse, low), high)
+        self._pulse = pulse
+        duty = int(pulse * self.frequency * 65535 / 1_000_000)
+        if duty != self._duty:
+            self.pwm.duty_cycle = duty
+            self._duty = duty
+
+    def move_to(
+        self,
+        angle: float = None,
+        *,
+        pulse: float = None,
+        speed: float = 180,
+        accel: float = 720,
+        profile: str = "trapezoid",
+    ):
+        """Move to an angle or pulse width along a motion profile
+
+        Args:
+            angle (float): target angle in degrees
+            pulse (float): target pulse width in us, instead of the angle
+            speed (float): top speed in degrees per second. default 180
+            accel (float): acceleration in degrees per second^2. default 720
+            profile (str): "trapezoid" or "scurve". default "trapezoid"
+        """
+        if profile not in ("trapezoid", "scurve"):
+            raise ValueError("profile must be trapezoid or scurve")
+        if speed <= 0 or accel <= 0:
+            raise ValueError("speed and accel must be above 0")
+        if angle is None and pulse is None:
+            raise ValueError("an angle or a pulse is needed")
+        if pulse is None:
+            target = self._angle_to_pulse(angle)
+        else:
+            # planned within the servo's range so the move ends on time
+            low, high = sorted((self.min_pulse, self.max_pulse))
+            target = min(max(pulse, low), high)
+        start = self.min_pulse if self._pulse is None else self._pulse
+        # degrees to us
+        scale = abs(self.max_pulse - self.min_pulse) / self.actuation_range
+        distance = target - start
+        length = abs(distance)
+        if not length:
+            self.pulse_width = target
+            return
+        speed *= scale
+        accel *= scale
+        if profile == "trapezoid":
+            ramp = speed / accel
+            if speed * ramp > length:
+                # too short to reach the top speed, a triangular profile
+                ramp = math.sqrt(length / accel)
+                speed = accel * ramp
+            duration = 2 * ramp + (length - speed * ramp) / speed
+            shape = (ramp, speed, accel)
+        else:
+            # cycloidal, the peak speed is 2 * length / duration and the peak
+            # acceleration 2 * pi * length / duration^2
+            duration = max(2 * length / speed, math.sqrt(2 * math.pi * length / accel))
+            shape = None
+        # under the lock so a finishing tick cannot idle the new move
+        with self.lock:
+            self._plan = (time.monotonic(), start, distance, duration, shape)
+            idle = self._stop is not None and self._stop.is_set()
+        if Thread:
+            if idle:
+                # the last move idled the thread, let it finish first
+                self.stop()
+            self.start()
+
+    def _travelled(self, t: float, length: float, duration: float, shape) -> float:
+        """Distance along the profile t seconds into the move"""
+        if t >= duration:
+            return length
+        if shape is None:
+            phase = 2 * math.pi * t / duration
+            return length * (phase - math.sin(phase)) / (2 * math.pi)
+        ramp, speed, accel = shape
+        if t < ramp:
+            return accel * t * t / 2
+        if t < duration - ramp:
+            return accel * ramp * ramp / 2 + speed * (t - ramp)
+        return length - accel * (duration - t) ** 2 / 2
+
+    def tick(self):
+        """Output the position due now on the motion profile"""
+        plan = self._plan
+        if plan is not None:
+            start, origin, distance, duration, shape = plan
+            t = time.monotonic() - start
+            travelled = self._travelled(t, abs(distance), duration, shape)
+            self._write(origin + math.copysign(travelled, distance))
+            if t >= duration and self._plan is plan:
+                self._plan = None
+        if self._plan is None and self._stop:
+            # nothing left to move, idle the thread until the next move_to()
+            self._stop.set()
+
+    def wait(self):
+        """Wait for the move to finish"""
+        while self._plan is not None:
+            if not self.running:
+                self.tick()
+            time.sleep(1 / self.rate)